@@ -0,0 +1,15 @@
+"""Shared pytest fixtures for the enhanced Memos test scripts"""
+
+import pytest
+
+from test_utils import client_from_env
+
+
+@pytest.fixture(scope="session")
+def memos_client():
+    """One client, and so one connection pool and search cache, for the whole test session"""
+    client = client_from_env()
+    if client is None:
+        pytest.skip("MEMOS_API_KEY not set")
+    yield client
+    client.close()
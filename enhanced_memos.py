@@ -1,9 +1,133 @@
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import asyncio
+import base64
+import copy
+import heapq
+import importlib.util
+import json
 import re
+import time
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from datetime import datetime, timezone
+from operator import itemgetter
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+# Decode response bodies with orjson when it is installed
+_loads = orjson.loads if orjson else json.loads
+
+
+def _encode_body(payload: Dict[str, Any]) -> bytes:
+    """Encode a request body as JSON bytes, with orjson when it is installed."""
+    if orjson:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode()
+
+
+# Seconds a fetched memo list is served from memory before revalidating
+DEFAULT_CACHE_TTL = 30.0
+
+# Markdown headers and list items, prioritized in smart summaries
+_BULLET_RE = re.compile(r'^(#{1,6} |[-*] |\d+\. )')
+_FIRST_LINE_RE = re.compile(r'^[^\n]*')
+# Match positions kept per memo; the relevance score saturates below this
+_MAX_MATCH_POSITIONS = 16
+# A tag with an optional leading #
+_TAG_RE = re.compile(r'#?([^\s#]+)')
+
+
+def _encode_cursor(entry: Tuple) -> str:
+    """
+    Encode a sort key as an opaque cursor.
+    
+    Keys are (createTime, memo ID) for time-ordered results and
+    (relevance score, createTime, memo ID) for relevance-ordered ones.
+    """
+    payload = {"t": entry[-2], "id": entry[-1]}
+    if len(entry) == 3:
+        payload["s"] = entry[0]
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple:
+    """
+    Decode a cursor produced by _encode_cursor back into a sort key.
+    
+    Raises:
+        MemosException: If the cursor is not one _encode_cursor produced
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError) as e:
+        raise MemosException(f"Invalid cursor: {cursor}") from e
+    
+    # Keys are compared with the index's, so every field must have its type
+    if (not isinstance(payload, dict)
+            or not isinstance(payload.get("t"), str)
+            or not isinstance(payload.get("id"), str)):
+        raise MemosException(f"Invalid cursor: {cursor}")
+    if "s" in payload:
+        score = payload["s"]
+        if isinstance(score, bool) or not isinstance(score, (int, float)):
+            raise MemosException(f"Invalid cursor: {cursor}")
+        return float(score), payload["t"], payload["id"]
+    return payload["t"], payload["id"]
+
+
+def _to_epoch(value: str) -> float:
+    """
+    Convert an ISO 8601 timestamp to epoch seconds.
+    
+    Naive timestamps are taken as UTC.
+    
+    Raises:
+        ValueError: If the value is not an ISO 8601 date or timestamp
+    """
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _with_tags(content: str, tags: Optional[List[str]]) -> str:
+    """Append tags to the end of memo content."""
+    if tags:
+        return content + "\n\n" + " ".join(tags)
+    return content
+
+
+def _truncate_at_word(text: str, max_length: int) -> str:
+    """Cut text to at most max_length characters, at the last space if there is one."""
+    cut = text.rfind(' ', 0, max_length)
+    return text[:cut] if cut != -1 else text[:max_length]
+
+
+def _normalize_tag(tag: str) -> Tuple[str, str]:
+    """
+    Normalize a tag given with or without its leading #.
+    
+    Returns:
+        The tag as ("#name", "name")
+    """
+    match = _TAG_RE.fullmatch(tag)
+    name = match.group(1) if match else tag.replace("#", "")
+    return f"#{name}", name
+
+
+def _normalize_memo_id(memo_id: str) -> str:
+    """Accept both full name format ("memos/123") and short ID format ("123")."""
+    return memo_id.rpartition("/")[-1]
+
 
 class MemosException(Exception):
     """Custom exception for Memos API errors"""
@@ -18,12 +142,14 @@ class ResponseFormat(Enum):
     ID_ONLY = "id_only"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class EnhancedMemosSearchParams:
     """Enhanced search parameters with pagination and filtering"""
     query: str = ""
     limit: int = 10
     offset: int = 0
+    cursor: Optional[str] = None
+    after_id: Optional[str] = None
     fields: List[str] = field(default_factory=lambda: ['id', 'content', 'tags', 'createTime'])
     summary_only: bool = False
     content_max_length: int = 500
@@ -35,19 +161,62 @@ class EnhancedMemosSearchParams:
     
     def __post_init__(self):
         """Validate parameters after initialization"""
+        # Frozen: clamp through object.__setattr__
         if self.limit > 50:
-            self.limit = 50  # Max limit to prevent token overflow
+            object.__setattr__(self, "limit", 50)  # Max limit to prevent token overflow
         if self.limit < 1:
-            self.limit = 1
+            object.__setattr__(self, "limit", 1)
         if self.offset < 0:
-            self.offset = 0
+            object.__setattr__(self, "offset", 0)
         if self.content_max_length < 50:
-            self.content_max_length = 50
+            object.__setattr__(self, "content_max_length", 50)
         if self.content_max_length > 2000:
-            self.content_max_length = 2000
+            object.__setattr__(self, "content_max_length", 2000)
+
+
+@dataclass(slots=True)
+class Memo:
+    """Normalized view of an API memo, built once when the memo list is indexed"""
+    id: str
+    content: str
+    lc_content: str
+    tags: Tuple[str, ...]
+    lc_tags: Tuple[str, ...]
+    create_time: str
+    create_time_epoch: float
+    raw: Dict[str, Any]
+    
+    @classmethod
+    def from_api(cls, memo: Dict[str, Any]) -> "Memo":
+        """
+        Build a memo view from a raw API memo.
+        
+        Args:
+            memo: Memo object as returned by the API
+            
+        Returns:
+            Memo with lowercase content and tags precomputed
+        """
+        content = memo.get("content", "")
+        tags = tuple(memo.get("tags", []))
+        create_time = memo.get("createTime", "")
+        try:
+            create_time_epoch = _to_epoch(create_time)
+        except ValueError:
+            create_time_epoch = float("-inf")  # Sort unparsable times first
+        return cls(
+            id=memo.get("name", ""),
+            content=content,
+            lc_content=content.lower(),
+            tags=tags,
+            lc_tags=tuple(tag.lower() for tag in tags),
+            create_time=create_time,
+            create_time_epoch=create_time_epoch,
+            raw=memo,
+        )
 
 
-@dataclass
+@dataclass(slots=True)
 class SearchResponse:
     """Response structure with pagination metadata"""
     memos: List[Dict[str, Any]]
@@ -55,16 +224,29 @@ class SearchResponse:
     has_more: bool
     next_offset: int
     query_metadata: Dict[str, Any]
+    next_cursor: Optional[str] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the response as the dict returned by the MCP tools."""
+        return {
+            "memos": self.memos,
+            "total_count": self.total_count,
+            "has_more": self.has_more,
+            "next_offset": self.next_offset,
+            "next_cursor": self.next_cursor,
+            "query_metadata": self.query_metadata
+        }
 
 
 class EnhancedMemos:
-    def __init__(self, memos_url, memos_api_key):
+    def __init__(self, memos_url, memos_api_key, cache_ttl: float = DEFAULT_CACHE_TTL):
         """
         Initialize an Enhanced Memos client with pagination support.
         
         Args:
             memos_url: The URL of the Memos API
             memos_api_key: API key for authentication
+            cache_ttl: Seconds to serve the cached memo list before revalidating
         """
         self.memos_url = memos_url
         self.memos_api_key = memos_api_key
@@ -73,126 +255,580 @@ class EnhancedMemos:
             "Accept": "application/json",
             "Content-Type": "application/json",
         }
+        
+        # Persistent session so calls reuse pooled keep-alive connections;
+        # the pool matches the async client's limits so callers searching
+        # from several threads keep their connections instead of dropping them
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=20,
+            max_retries=Retry(total=2, backoff_factor=0.1, status_forcelist=[502, 503, 504]),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        
+        # Async counterpart for the a*-prefixed methods, so concurrent tool
+        # calls overlap on the event loop instead of blocking it; with the h2
+        # package installed they also multiplex over one HTTP/2 connection
+        self._aclient = httpx.AsyncClient(
+            headers=self.headers,
+            http2=importlib.util.find_spec("h2") is not None,
+            timeout=httpx.Timeout(10.0),
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=20),
+        )
+        # Concurrent async searches share one refetch of a stale cache
+        self._refresh_lock = asyncio.Lock()
+        
+        # Memo formatter per response format, picked once per search
+        self._formatters = {
+            ResponseFormat.ID_ONLY: self._format_id_only,
+            ResponseFormat.MINIMAL: self._format_minimal,
+            ResponseFormat.SUMMARY: self._format_summary,
+            ResponseFormat.FULL: self._format_full,
+        }
+        
+        self.cache_ttl = cache_ttl
+        self._cache = self._build_index([])
+        self._invalidate_cache()
+        # Whether the server accepts `filter=` on the memo list (None: unknown yet)
+        self._server_supports_filter = None
+        # Authenticated user, fetched on first get_user_id()
+        self._user_id = None
+    
+    def close(self):
+        """Close the underlying HTTP session and its pooled connections."""
+        self.session.close()
+    
+    async def aclose(self):
+        """Close the async HTTP client and its pooled connections."""
+        await self._aclient.aclose()
+    
+    @staticmethod
+    def _build_index(memos: List[Dict[str, Any]], etag: Optional[str] = None,
+                     last_modified: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Build the in-memory search index over a fetched memo list.
+        
+        Args:
+            memos: Raw memo objects as returned by the API
+            etag: ETag of the response the memos came from
+            last_modified: Last-Modified header of that response
+            
+        Returns:
+            Index with Memo views by ID, tag -> IDs and (createTime, ID)
+            pairs sorted oldest first
+        """
+        by_id = {}
+        by_tag = defaultdict(set)
+        by_time = []
+        
+        for raw in memos:
+            memo = Memo.from_api(raw)
+            by_id[memo.id] = memo
+            for tag in memo.tags:
+                by_tag[tag].add(memo.id)
+            by_time.append((memo.create_time, memo.id))
+        
+        by_time.sort()
+        
+        return {
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": time.monotonic(),
+            "by_id": by_id,
+            "by_tag": by_tag,
+            "by_time": by_time,
+            # Joined lowercase contents for _scan_corpus, built on first use
+            "corpus": None,
+            # Newest memo IDs per (tag, limit) for _memos_by_tag
+            "tag_pages": {},
+        }
+    
+    def _invalidate_cache(self):
+        """Force the next search to revalidate the cached memo list."""
+        self._cache["fetched_at"] = None
+    
+    def _index_add(self, memo: Dict[str, Any]):
+        """
+        Insert or replace a memo in the cached index after a write.
+        
+        Keeps by_time sorted with insort so the cache stays usable
+        without refetching the whole memo list.
+        
+        Args:
+            memo: Memo object as returned by the API
+        """
+        if self._cache["fetched_at"] is None:
+            return  # Nothing cached; the next search refetches anyway
+        
+        memo = Memo.from_api(memo)
+        self._index_remove(memo.id)
+        
+        cache = self._cache
+        cache["corpus"] = None
+        cache["tag_pages"].clear()
+        cache["by_id"][memo.id] = memo
+        for tag in memo.tags:
+            cache["by_tag"][tag].add(memo.id)
+        insort(cache["by_time"], (memo.create_time, memo.id))
+    
+    def _index_remove(self, memo_id: str):
+        """
+        Remove a memo from the cached index, if present.
+        
+        Args:
+            memo_id: Full memo name ('memos/XXX')
+        """
+        cache = self._cache
+        memo = cache["by_id"].pop(memo_id, None)
+        if memo is None:
+            return
+        
+        cache["corpus"] = None
+        cache["tag_pages"].clear()
+        by_tag = cache["by_tag"]
+        for tag in memo.tags:
+            by_tag[tag].discard(memo_id)
+            if not by_tag[tag]:
+                del by_tag[tag]
+        
+        by_time = cache["by_time"]
+        entry = (memo.create_time, memo_id)
+        idx = bisect_left(by_time, entry)
+        if idx < len(by_time) and by_time[idx] == entry:
+            del by_time[idx]
+    
+    def _cache_is_fresh(self) -> bool:
+        """Check whether the cached memo list is still within its TTL."""
+        fetched_at = self._cache["fetched_at"]
+        return fetched_at is not None and time.monotonic() - fetched_at < self.cache_ttl
+    
+    def _refresh_cache(self) -> Dict[str, Any]:
+        """
+        Return the memo index, refetching it once the TTL has expired.
+        
+        Revalidation uses a conditional GET so an unchanged memo list
+        is answered with 304 and the existing index is kept.
+        
+        Returns:
+            The current memo index
+            
+        Raises:
+            MemosException: If the API returns an unexpected status
+            requests.RequestException: If the request fails
+        """
+        if self._cache_is_fresh():
+            return self._cache
+        
+        response = self.session.get(f"{self.memos_url}/api/v1/memos", headers=self._conditional_headers())
+        return self._store_list_response(response)
+    
+    async def _arefresh_cache(self) -> Dict[str, Any]:
+        """
+        Async version of _refresh_cache.
+        
+        Returns:
+            The current memo index
+            
+        Raises:
+            MemosException: If the API returns an unexpected status
+            httpx.HTTPError: If the request fails
+        """
+        if self._cache_is_fresh():
+            return self._cache
+        
+        async with self._refresh_lock:
+            # Another task may have refetched while we waited for the lock
+            if self._cache_is_fresh():
+                return self._cache
+            
+            response = await self._aclient.get(f"{self.memos_url}/api/v1/memos", headers=self._conditional_headers())
+            return self._store_list_response(response)
+    
+    def _conditional_headers(self) -> Dict[str, str]:
+        """Build the revalidation headers for the cached memo list."""
+        headers = {}
+        if self._cache["etag"]:
+            headers["If-None-Match"] = self._cache["etag"]
+        if self._cache["last_modified"]:
+            headers["If-Modified-Since"] = self._cache["last_modified"]
+        return headers
+    
+    def _store_list_response(self, response) -> Dict[str, Any]:
+        """
+        Update the cached index from a memo list response.
+        
+        Args:
+            response: requests or httpx response to the conditional GET
+            
+        Returns:
+            The current memo index
+        """
+        if response.status_code == 304:
+            self._cache["fetched_at"] = time.monotonic()
+            return self._cache
+        response.raise_for_status()
+        
+        if response.status_code != 200:
+            raise MemosException(f"Error searching memos: {response.status_code}")
+        
+        self._cache = self._build_index(
+            _loads(response.content).get("memos", []),
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+        return self._cache
+    
+    def _build_filter(self, params: EnhancedMemosSearchParams) -> str:
+        """
+        Translate search parameters into a Memos API filter expression.
+        
+        Only filters the server is guaranteed to answer with a superset of
+        the client-side matches are pushed down, since the client can drop
+        extra memos but never recover missing ones. The query is not: how
+        content.contains handles case depends on the server's database,
+        and create_time comparisons on how it stores and compares times.
+        
+        Args:
+            params: Search parameters including tag filters
+            
+        Returns:
+            CEL filter expression, or an empty string if nothing to filter
+        """
+        conditions = []
+        if params.tags_filter:
+            # JSON string literals are valid CEL string literals
+            tags = ", ".join(json.dumps(tag) for tag in params.tags_filter)
+            conditions.append(f"tag in [{tags}]")
+        return " && ".join(conditions)
+    
+    def _fetch_filtered(self, params: EnhancedMemosSearchParams) -> Optional[Dict[str, Any]]:
+        """
+        Fetch only the memos matching the search filters, indexed.
+        
+        The result is not cached; the full memo list stays the cache.
+        
+        Args:
+            params: Search parameters, translated by _build_filter
+            
+        Returns:
+            Index over the matching memos, or None if there is nothing to
+            filter or the server does not support filtering
+            
+        Raises:
+            MemosException: If the API returns an unexpected status
+            requests.RequestException: If the request fails
+        """
+        filter_expr = self._build_filter(params)
+        if not filter_expr:
+            return None
+        response = self.session.get(
+            f"{self.memos_url}/api/v1/memos",
+            params={"filter": filter_expr},
+        )
+        return self._index_filtered_response(response)
+    
+    async def _afetch_filtered(self, params: EnhancedMemosSearchParams) -> Optional[Dict[str, Any]]:
+        """Async version of _fetch_filtered."""
+        filter_expr = self._build_filter(params)
+        if not filter_expr:
+            return None
+        response = await self._aclient.get(
+            f"{self.memos_url}/api/v1/memos",
+            params={"filter": filter_expr},
+        )
+        return self._index_filtered_response(response)
+    
+    def _index_filtered_response(self, response) -> Optional[Dict[str, Any]]:
+        """
+        Index the memos from a filtered list response.
+        
+        Args:
+            response: requests or httpx response to the filtered GET
+            
+        Returns:
+            Index over the matching memos, or None if the server rejected
+            the filter
+        """
+        if response.status_code == 400:
+            # Older servers reject the filter syntax; search the full list instead
+            self._server_supports_filter = False
+            return None
+        response.raise_for_status()
+        
+        if response.status_code != 200:
+            raise MemosException(f"Error searching memos: {response.status_code}")
+        
+        self._server_supports_filter = True
+        return self._build_index(_loads(response.content).get("memos", []))
+    
+    def _may_fetch_filtered(self, params: EnhancedMemosSearchParams) -> bool:
+        """Check whether a search may be answered from a server-filtered fetch."""
+        return (
+            not params.after_id
+            and not self._cache_is_fresh()
+            and self._server_supports_filter is not False
+        )
+    
+    def _load_index(self, params: EnhancedMemosSearchParams) -> Dict[str, Any]:
+        """
+        Get the memo index to run a search against.
+        
+        A fresh cached memo list is always used. Otherwise tag-filtered
+        searches let the server narrow the memos, and other searches (or
+        servers without filter support) refetch the full list. Searches
+        resuming after_id also use the full list, so the anchor memo is
+        found whether or not it matches the filters.
+        
+        Args:
+            params: Search parameters
+            
+        Returns:
+            Memo index built by _build_index
+        """
+        if self._may_fetch_filtered(params):
+            index = self._fetch_filtered(params)
+            if index is not None:
+                return index
+        return self._refresh_cache()
+    
+    async def _aload_index(self, params: EnhancedMemosSearchParams) -> Dict[str, Any]:
+        """Async version of _load_index."""
+        if self._may_fetch_filtered(params):
+            index = await self._afetch_filtered(params)
+            if index is not None:
+                return index
+        return await self._arefresh_cache()
     
     def get_user_id(self) -> str:
         """
         Get the user ID of the authenticated user by checking auth status.
         
+        The ID belongs to the API key, so it is fetched once per client.
+        
         Returns:
             str: The user ID of the authenticated user
             
         Raises:
             MemosException: If there is an error retrieving the user ID
         """
+        if self._user_id is not None:
+            return self._user_id
+        
         try:
-            response = requests.get(
-                f"{self.memos_url}/api/v1/auth/status", headers=self.headers
-            )
+            response = self.session.get(f"{self.memos_url}/api/v1/auth/status")
             response.raise_for_status()
             
-            user_data = response.json()
+            user_data = _loads(response.content)
             user_id = user_data.get("name")
             
             if not user_id:
                 raise MemosException("Could not retrieve user ID from auth status")
             
+            self._user_id = user_id
             return user_id
-        except requests.RequestException as e:
+        except (requests.RequestException, ValueError) as e:
             raise MemosException(f"Error getting user ID: {e}")
     
-    def _apply_response_format(self, memo: Dict[str, Any], params: EnhancedMemosSearchParams, query: str = "") -> Dict[str, Any]:
+    def _format_id_only(self, memo: Memo, params: EnhancedMemosSearchParams, query_lower: str) -> Dict[str, Any]:
+        """Format a memo as just its ID."""
+        return {"id": memo.id}
+    
+    def _format_minimal(self, memo: Memo, params: EnhancedMemosSearchParams, query_lower: str) -> Dict[str, Any]:
+        """Format a memo as its first line of content and tags."""
+        return {
+            "id": memo.id,
+            "createTime": memo.create_time,
+            "updateTime": memo.raw.get("updateTime", ""),
+            "snippet": _FIRST_LINE_RE.match(memo.content).group()[:100],
+            "tags": list(memo.tags),
+        }
+    
+    def _format_summary(self, memo: Memo, params: EnhancedMemosSearchParams, query_lower: str) -> Dict[str, Any]:
         """
-        Apply response format to a memo based on parameters.
+        Format a memo with a smart summary and highlighted matches.
         
         Args:
-            memo: The raw memo data
-            params: Search parameters including response format
-            query: Search query for smart summarization
+            memo: The indexed memo view
+            params: Search parameters including query and content_max_length
+            query_lower: Lowercase search query
             
         Returns:
             Formatted memo data
         """
-        # Always include memo ID
-        memo_id = memo.get("name", "")
+        formatted = {
+            "id": memo.id,
+            "createTime": memo.create_time,
+            "updateTime": memo.raw.get("updateTime", ""),
+        }
+        content = memo.content
+        query = params.query
         
-        if params.response_format == ResponseFormat.ID_ONLY:
-            return {"id": memo_id}
+        if params.summary_only or query:
+            # Scan for matches once and share them below
+            positions = self._find_all_positions(memo.lc_content, query_lower) if query else None
+            
+            # Use smart summarization
+            formatted["content"] = self._generate_smart_summary(
+                memo, query, params.content_max_length,
+                lines=None if query else content.split('\n'),
+                positions=positions
+            )
+            
+            # Add match snippets if searching
+            if query:
+                snippets = self._extract_snippet_around_match(
+                    memo, query, context_chars=50, positions=positions[:3]  # Top 3 matches
+                )
+                if snippets:
+                    formatted["match_snippets"] = snippets
+                
+                # Add relevance score
+                formatted["relevance_score"] = self._calculate_relevance_score(
+                    memo, query_lower, positions=positions
+                )
+        else:
+            # Regular truncation
+            truncated_content = content[:params.content_max_length]
+            if len(content) > params.content_max_length:
+                truncated_content += "..."
+            formatted["content"] = truncated_content
         
-        # Extract basic fields
+        formatted["tags"] = list(memo.tags)
+        formatted["snippet"] = memo.raw.get("snippet", "")
+        return formatted
+    
+    def _format_full(self, memo: Memo, params: EnhancedMemosSearchParams, query_lower: str) -> Dict[str, Any]:
+        """Format a memo with all requested raw fields."""
+        raw = memo.raw
         formatted = {
-            "id": memo_id,
-            "createTime": memo.get("createTime", ""),
-            "updateTime": memo.get("updateTime", ""),
+            "id": memo.id,
+            "createTime": memo.create_time,
+            "updateTime": raw.get("updateTime", ""),
         }
+        for field in params.fields:
+            if field in raw:
+                value = raw[field]
+                # Lists and objects (tags, resources, ...) are copied so
+                # callers cannot modify the indexed memo through them
+                if isinstance(value, (list, dict)):
+                    value = copy.deepcopy(value)
+                formatted[field] = value
+        return formatted
+    
+    def _page_anchor(self, cache: Dict[str, Any], params: EnhancedMemosSearchParams,
+                     by_relevance: bool) -> Optional[Tuple]:
+        """
+        Find the sort key a page continues after, if the search names one.
         
-        # Add content based on format
-        content = memo.get("content", "")
+        The key comes from `params.cursor` or, failing that, from the memo
+        named by `params.after_id`, so a page can be resumed from the last
+        memo ID a caller saw without holding on to a cursor.
         
-        if params.response_format == ResponseFormat.MINIMAL:
-            # Minimal: just first line of content and tags
-            first_line = content.split('\n')[0][:100] if content else ""
-            formatted["snippet"] = first_line
-            formatted["tags"] = memo.get("tags", [])
-            
-        elif params.response_format == ResponseFormat.SUMMARY:
-            # Summary: smart summary with highlighted matches
-            if params.summary_only or query:
-                # Use smart summarization
-                formatted["content"] = self._generate_smart_summary(memo, query, params.content_max_length)
-                
-                # Add match snippets if searching
-                if query:
-                    snippets = self._extract_snippet_around_match(content, query, context_chars=50)
-                    if snippets:
-                        formatted["match_snippets"] = snippets[:3]  # Top 3 matches
-                    
-                    # Add relevance score
-                    formatted["relevance_score"] = self._calculate_relevance_score(
-                        content, query, memo.get("tags", [])
-                    )
-            else:
-                # Regular truncation
-                truncated_content = content[:params.content_max_length]
-                if len(content) > params.content_max_length:
-                    truncated_content += "..."
-                formatted["content"] = truncated_content
+        Args:
+            cache: Memo index built by _build_index
+            params: Search parameters including cursor and after_id
+            by_relevance: Whether the search is ordered by relevance
             
-            formatted["tags"] = memo.get("tags", [])
-            formatted["snippet"] = memo.get("snippet", "")
+        Returns:
+            (createTime, memo ID), or (score, createTime, memo ID) for
+            relevance-ordered searches; None to paginate by offset
             
-        else:  # FULL format
-            # Include all fields requested
-            for field in params.fields:
-                if field in memo:
-                    formatted[field] = memo[field]
-        
-        # Remove verbose node structures unless specifically requested
-        if "nodes" in formatted and params.response_format != ResponseFormat.FULL:
-            del formatted["nodes"]
-        
-        return formatted
+        Raises:
+            MemosException: If the cursor or after_id cannot be resumed from
+        """
+        if params.cursor:
+            after = _decode_cursor(params.cursor)
+            if by_relevance and len(after) != 3:
+                raise MemosException(f"Cursor does not belong to a relevance-ordered search: {params.cursor}")
+            if not by_relevance and len(after) != 2:
+                raise MemosException(f"Cursor does not belong to a time-ordered search: {params.cursor}")
+            return after
+        if params.after_id:
+            memo = cache["by_id"].get(f"memos/{_normalize_memo_id(params.after_id)}")
+            if memo is None:
+                raise MemosException(f"Unknown after_id: {params.after_id}")
+            if by_relevance:
+                return self._calculate_relevance_score(memo, params.query.lower()), memo.create_time, memo.id
+            return memo.create_time, memo.id
+        return None
     
-    def _paginate_results(self, all_items: List[Dict[str, Any]], params: EnhancedMemosSearchParams) -> Tuple[List[Dict[str, Any]], bool, int]:
+    def _paginate_results(self, entries: List[Tuple[str, str]], params: EnhancedMemosSearchParams,
+                          after: Optional[Tuple[str, str]] = None) -> Tuple[List[Tuple[str, str]], bool, int, int]:
         """
         Apply pagination to results.
         
+        Pages are taken newest first from the end of the time-sorted
+        entries, either after the `after` key (found by bisection) or,
+        for backward compatibility, after skipping `params.offset` entries.
+        
         Args:
-            all_items: All items before pagination
+            entries: (createTime, memo ID) pairs of all matches, oldest first
             params: Search parameters including limit and offset
+            after: Sort key the page continues after, from _page_anchor
+            
+        Returns:
+            Tuple of (page entries newest first, has_more, total_count, next_offset)
+        """
+        total_count = len(entries)
+        
+        # Newest-first pages end where the previous page stopped
+        if after is not None:
+            end_idx = bisect_left(entries, after)
+        else:
+            end_idx = max(0, total_count - params.offset)
+        start_idx = max(0, end_idx - params.limit)
+        
+        paginated_items = entries[start_idx:end_idx][::-1]
+        has_more = start_idx > 0
+        next_offset = total_count - start_idx if has_more else -1
+        
+        return paginated_items, has_more, total_count, next_offset
+    
+    def _paginate_by_relevance(self, cache: Dict[str, Any], entries: List[Tuple[str, str]],
+                               params: EnhancedMemosSearchParams,
+                               after: Optional[Tuple[float, str, str]] = None) -> Tuple[List[Tuple[float, str, str]], bool, int, int]:
+        """
+        Rank matches by relevance and cut out one page.
+        
+        Every match is scored so a page holds the globally most relevant
+        memos, and a bounded heap selects only as many as the page needs.
+        Ties are broken newest first.
+        
+        Args:
+            cache: Memo index built by _build_index
+            entries: (createTime, memo ID) pairs of all matches
+            params: Search parameters including query, limit and offset
+            after: Sort key the page continues after, from _page_anchor
             
         Returns:
-            Tuple of (paginated items, has_more, total_count)
+            Tuple of (page keys as (score, createTime, memo ID), has_more,
+            total_count, next_offset)
         """
-        total_count = len(all_items)
+        by_id = cache["by_id"]
+        query_lower = params.query.lower()
+        keys = []
+        for create_time, memo_id in entries:
+            score = self._calculate_relevance_score(by_id[memo_id], query_lower)
+            keys.append((score, create_time, memo_id))
+        total_count = len(keys)
         
-        # Apply offset and limit
-        start_idx = params.offset
-        end_idx = start_idx + params.limit
+        if after is not None:
+            keys = [key for key in keys if key < after]
+            skip = 0
+        else:
+            skip = params.offset
+        consumed = total_count - len(keys) + skip
         
-        paginated_items = all_items[start_idx:end_idx]
-        has_more = end_idx < total_count
+        # One extra key tells whether another page follows
+        top = heapq.nlargest(skip + params.limit + 1, keys)
+        paginated_items = top[skip:skip + params.limit]
+        has_more = len(top) > skip + params.limit
+        next_offset = consumed + params.limit if has_more else -1
         
-        return paginated_items, has_more, total_count
+        return paginated_items, has_more, total_count, next_offset
     
     def search_memos_enhanced(self, params: EnhancedMemosSearchParams) -> SearchResponse:
         """
@@ -208,118 +844,252 @@ class EnhancedMemos:
             MemosException: If there is an error searching memos
         """
         try:
-            # Fetch all memos first (we'll optimize this later with API pagination)
-            response = requests.get(
-                f"{self.memos_url}/api/v1/memos",
-                headers=self.headers,
-            )
-            response.raise_for_status()
+            cache = self._load_index(params)
+        except (requests.RequestException, ValueError) as e:
+            raise MemosException(f"Error searching memos: {e}")
+        
+        return self._search_index(cache, params)
+    
+    async def asearch_memos_enhanced(self, params: EnhancedMemosSearchParams) -> SearchResponse:
+        """
+        Async version of search_memos_enhanced.
+        
+        Args:
+            params: Enhanced search parameters
             
-            if response.status_code == 200:
-                all_memos = response.json().get("memos", [])
-                
-                # Apply search filter if query provided
-                if params.query:
-                    filtered_memos = [
-                        memo for memo in all_memos 
-                        if params.query.lower() in memo.get("content", "").lower()
-                    ]
-                else:
-                    filtered_memos = all_memos
-                
-                # Apply tag filter if specified
-                if params.tags_filter:
-                    filtered_memos = [
-                        memo for memo in filtered_memos
-                        if any(tag in memo.get("tags", []) for tag in params.tags_filter)
-                    ]
-                
-                # Apply date filters if specified
-                if params.date_from or params.date_to:
-                    filtered_memos = self._apply_date_filter(filtered_memos, params.date_from, params.date_to)
-                
-                # Sort by creation time (newest first)
-                filtered_memos.sort(key=lambda x: x.get("createTime", ""), reverse=True)
-                
-                # Apply pagination
-                paginated_memos, has_more, total_count = self._paginate_results(filtered_memos, params)
-                
-                # Apply response format to each memo
-                formatted_memos = [
-                    self._apply_response_format(memo, params, params.query) 
-                    for memo in paginated_memos
-                ]
-                
-                # Sort by relevance if searching
-                if params.query and any('relevance_score' in memo for memo in formatted_memos):
-                    formatted_memos.sort(key=lambda x: x.get('relevance_score', 0), reverse=True)
-                
-                # Calculate next offset
-                next_offset = params.offset + params.limit if has_more else -1
-                
-                return SearchResponse(
-                    memos=formatted_memos,
-                    total_count=total_count,
-                    has_more=has_more,
-                    next_offset=next_offset,
-                    query_metadata={
-                        "query": params.query,
-                        "limit": params.limit,
-                        "offset": params.offset,
-                        "format": params.response_format.value,
-                        "filtered_count": total_count,
-                        "returned_count": len(formatted_memos)
-                    }
-                )
-            else:
-                raise MemosException(f"Error searching memos: {response.status_code}")
-        except requests.RequestException as e:
+        Returns:
+            SearchResponse with paginated and formatted results
+            
+        Raises:
+            MemosException: If there is an error searching memos
+        """
+        try:
+            cache = await self._aload_index(params)
+        except (httpx.HTTPError, ValueError) as e:
             raise MemosException(f"Error searching memos: {e}")
+        
+        return self._search_index(cache, params)
     
-    def _apply_date_filter(self, memos: List[Dict[str, Any]], date_from: Optional[str], date_to: Optional[str]) -> List[Dict[str, Any]]:
-        """Apply date range filtering to memos."""
-        filtered = memos
+    def _search_index(self, cache: Dict[str, Any], params: EnhancedMemosSearchParams) -> SearchResponse:
+        """
+        Run a search against a loaded memo index.
+        
+        Args:
+            cache: Memo index from _load_index
+            params: Enhanced search parameters
+            
+        Returns:
+            SearchResponse with paginated and formatted results
+        """
+        # Select matching memos from the index (sorted by time); filters are
+        # applied here too so results match whether or not the server filtered
+        entries = self._select_memos(cache, params)
+        
+        # Apply pagination, by relevance when the format reports scores
+        by_relevance = bool(params.query) and params.response_format == ResponseFormat.SUMMARY
+        after = self._page_anchor(cache, params, by_relevance)
+        if by_relevance:
+            page, has_more, total_count, next_offset = self._paginate_by_relevance(cache, entries, params, after)
+        else:
+            page, has_more, total_count, next_offset = self._paginate_results(entries, params, after)
+        by_id = cache["by_id"]
+        paginated_memos = [by_id[key[-1]] for key in page]
         
-        if date_from:
-            filtered = [
-                memo for memo in filtered
-                if memo.get("createTime", "") >= date_from
-            ]
+        # Apply response format to each memo, lowering the query only once
+        query_lower = params.query.lower()
+        format_memo = self._formatters[params.response_format]
+        formatted_memos = [format_memo(memo, params, query_lower) for memo in paginated_memos]
         
-        if date_to:
-            filtered = [
-                memo for memo in filtered
-                if memo.get("createTime", "") <= date_to
-            ]
+        query_metadata = {
+            "query": params.query,
+            "limit": params.limit,
+            "offset": params.offset,
+            "cursor": params.cursor,
+            "after_id": params.after_id,
+            "format": params.response_format.value,
+            "filtered_count": total_count,
+            "returned_count": len(formatted_memos)
+        }
+        if params.offset and not (params.cursor or params.after_id):
+            query_metadata["deprecation"] = "offset pagination is deprecated; pass next_cursor as cursor instead"
         
-        return filtered
+        return SearchResponse(
+            memos=formatted_memos,
+            total_count=total_count,
+            has_more=has_more,
+            next_offset=next_offset,
+            query_metadata=query_metadata,
+            next_cursor=_encode_cursor(page[-1]) if has_more else None
+        )
     
-    def _extract_snippet_around_match(self, content: str, query: str, context_chars: int = 50) -> List[str]:
+    def _select_memos(self, cache: Dict[str, Any], params: EnhancedMemosSearchParams) -> List[Tuple[str, str]]:
+        """
+        Select memos matching the search filters from the index.
+        
+        Args:
+            cache: Memo index built by _build_index
+            params: Search parameters including query, tag and date filters
+            
+        Returns:
+            (createTime, memo ID) pairs of the matching memos, oldest first
+        """
+        by_id = cache["by_id"]
+        window = self._apply_date_filter(cache["by_time"], by_id, params.date_from, params.date_to)
+        narrowed = False
+        
+        # Memos carrying any of the requested tags
+        candidates = None
+        if params.tags_filter:
+            by_tag = cache["by_tag"]
+            candidates = set().union(*(by_tag.get(tag, ()) for tag in params.tags_filter))
+            
+            # Walk the (smaller) tag hits instead of the whole date window
+            if len(candidates) < len(window):
+                window = self._apply_date_filter(
+                    sorted((by_id[memo_id].create_time, memo_id) for memo_id in candidates),
+                    by_id, params.date_from, params.date_to
+                )
+                candidates = None
+                narrowed = True
+        
+        query_lower = params.query.lower()
+        
+        # Unless tags already narrowed the window, find query hits with one
+        # sweep over the whole corpus rather than a check per memo
+        if query_lower and not narrowed and "\0" not in query_lower:
+            hits = self._scan_corpus(cache, query_lower)
+            candidates = hits if candidates is None else candidates & hits
+            query_lower = ""
+        
+        if candidates is None and not query_lower:
+            return window
+        
+        return [
+            entry for entry in window
+            if (candidates is None or entry[1] in candidates)
+            and (not query_lower or query_lower in by_id[entry[1]].lc_content)
+        ]
+    
+    def _scan_corpus(self, cache: Dict[str, Any], query_lower: str) -> set:
+        """
+        Find the memos whose content contains the query in a single scan.
+        
+        All lowercase contents are joined into one NUL-separated buffer
+        (built lazily and kept on the index), so str.find skips over
+        non-matching memos in C. Each hit is mapped back to its memo by
+        bisecting the start offsets, and the scan resumes at the next memo.
+        
+        Args:
+            cache: Memo index built by _build_index
+            query_lower: Lowercase search query, without NUL characters
+            
+        Returns:
+            IDs of the memos containing the query
+        """
+        corpus = cache.get("corpus")
+        if corpus is None:
+            memos = list(cache["by_id"].values())
+            ids = [memo.id for memo in memos]
+            offsets = []
+            start = 0
+            for memo in memos:
+                offsets.append(start)
+                start += len(memo.lc_content) + 1
+            corpus = cache["corpus"] = ("\0".join(memo.lc_content for memo in memos), offsets, ids)
+        
+        buffer, offsets, ids = corpus
+        hits = set()
+        pos = buffer.find(query_lower)
+        while pos != -1:
+            idx = bisect_right(offsets, pos) - 1
+            hits.add(ids[idx])
+            if idx + 1 == len(offsets):
+                break
+            pos = buffer.find(query_lower, offsets[idx + 1])
+        
+        return hits
+    
+    def _apply_date_filter(self, by_time: List[Tuple[str, str]], by_id: Dict[str, Memo],
+                           date_from: Optional[str], date_to: Optional[str]) -> List[Tuple[str, str]]:
+        """
+        Slice time-sorted index entries down to a date range.
+        
+        Bounds are located by binary search on epoch seconds, so dates
+        with any UTC offset (or date-only values) compare correctly.
+        
+        Args:
+            by_time: (createTime, memo ID) pairs sorted oldest first
+            by_id: Memo views by memo ID
+            date_from: Earliest createTime to include (ISO format)
+            date_to: Latest createTime to include (ISO format)
+            
+        Returns:
+            The entries within the range, oldest first
+        """
+        lo = self._bisect_time(by_time, by_id, date_from, bisect_left) if date_from else 0
+        hi = self._bisect_time(by_time, by_id, date_to, bisect_right) if date_to else len(by_time)
+        return by_time[lo:hi]
+    
+    @staticmethod
+    def _bisect_time(by_time: List[Tuple[str, str]], by_id: Dict[str, Memo], value: str, bisect) -> int:
+        """Find where a date bound falls in time-sorted index entries."""
+        try:
+            return bisect(by_time, _to_epoch(value), key=lambda entry: by_id[entry[1]].create_time_epoch)
+        except ValueError:
+            # Not an ISO date; compare the raw createTime strings instead
+            return bisect(by_time, value, key=itemgetter(0))
+    
+    def _find_all_positions(self, content_lower: str, query_lower: str,
+                            cap: int = _MAX_MATCH_POSITIONS) -> List[int]:
+        """
+        Find the offsets of every match of the query in a single sweep.
+        
+        Matches may overlap, so each one can get a snippet. Stops after
+        `cap` matches: only the first few are turned into snippets, and
+        the relevance score saturates below 10 matches.
+        
+        Args:
+            content_lower: Lowercase memo content
+            query_lower: Lowercase search query
+            cap: Maximum number of positions to return
+            
+        Returns:
+            Start offsets of the matches, in order
+        """
+        positions = []
+        if not query_lower:
+            return positions
+        
+        pos = content_lower.find(query_lower)
+        while pos != -1 and len(positions) < cap:
+            positions.append(pos)
+            pos = content_lower.find(query_lower, pos + 1)
+        
+        return positions
+    
+    def _extract_snippet_around_match(self, memo: Memo, query: str, context_chars: int = 50,
+                                      positions: Optional[List[int]] = None) -> List[str]:
         """
         Extract snippets around matched keywords.
         
         Args:
-            content: Full content to search
+            memo: Memo to search
             query: Search query
             context_chars: Number of characters to include before/after match
+            positions: Precomputed match offsets from _find_all_positions
             
         Returns:
             List of snippets with context around matches
         """
+        content = memo.content
         if not query or not content:
             return []
         
         snippets = []
-        query_lower = query.lower()
-        content_lower = content.lower()
-        
-        # Find all occurrences of the query
-        start = 0
-        while True:
-            pos = content_lower.find(query_lower, start)
-            if pos == -1:
-                break
-            
+        if positions is None:
+            positions = self._find_all_positions(memo.lc_content, query.lower())
+        
+        for pos in positions:
             # Extract snippet with context
             snippet_start = max(0, pos - context_chars)
             snippet_end = min(len(content), pos + len(query) + context_chars)
@@ -330,56 +1100,66 @@ class EnhancedMemos:
             while snippet_end < len(content) and content[snippet_end].isalnum():
                 snippet_end += 1
             
-            snippet = content[snippet_start:snippet_end]
+            match_end = pos + len(query)
             
-            # Add ellipsis if needed
+            # Assemble the snippet with the match highlighted (markdown bold)
+            # and ellipses where it was cut
+            parts = []
             if snippet_start > 0:
-                snippet = "..." + snippet
+                parts.append("...")
+            parts.append(content[snippet_start:pos])
+            parts.append("**")
+            parts.append(content[pos:match_end])
+            parts.append("**")
+            parts.append(content[match_end:snippet_end])
             if snippet_end < len(content):
-                snippet = snippet + "..."
+                parts.append("...")
             
-            # Highlight the match (using markdown bold)
-            highlighted = snippet.replace(
-                content[pos:pos + len(query)],
-                f"**{content[pos:pos + len(query)]}**"
-            )
-            
-            snippets.append(highlighted)
-            start = pos + 1
+            snippets.append("".join(parts))
         
         return snippets
     
-    def _calculate_relevance_score(self, content: str, query: str, tags: List[str] = None) -> float:
+    def _calculate_relevance_score(self, memo: Memo, query_lower: str,
+                                   positions: Optional[List[int]] = None) -> float:
         """
         Calculate relevance score based on match frequency and position.
         
         Args:
-            content: Memo content
-            query: Search query
-            tags: Memo tags
+            memo: Memo to score
+            query_lower: Lowercase search query
+            positions: Precomputed match offsets from _find_all_positions
             
         Returns:
             Relevance score (0.0 to 1.0)
         """
-        if not query:
+        if not query_lower:
             return 0.5  # Default score for no query
         
-        query_lower = query.lower()
-        content_lower = content.lower()
+        content_lower = memo.lc_content
+        if positions is None:
+            positions = self._find_all_positions(content_lower, query_lower)
         
-        # Count occurrences
-        match_count = content_lower.count(query_lower)
+        # Count occurrences without overlaps, as str.count does; past the
+        # cap the positions are incomplete, so count the content itself
+        if len(positions) < _MAX_MATCH_POSITIONS:
+            match_count = 0
+            match_end = 0
+            for pos in positions:
+                if pos >= match_end:
+                    match_count += 1
+                    match_end = pos + len(query_lower)
+        else:
+            match_count = content_lower.count(query_lower)
         
         # Bonus for title matches (first line)
-        first_line = content.split('\n')[0] if content else ""
-        title_bonus = 2.0 if query_lower in first_line.lower() else 0.0
+        first_line = _FIRST_LINE_RE.match(content_lower).group()
+        title_bonus = 2.0 if query_lower in first_line else 0.0
         
         # Bonus for tag matches
-        tag_bonus = 1.0 if tags and any(query_lower in tag.lower() for tag in tags) else 0.0
+        tag_bonus = 1.0 if any(query_lower in tag for tag in memo.lc_tags) else 0.0
         
         # Calculate position score (earlier matches are better)
-        first_match = content_lower.find(query_lower)
-        position_score = 1.0 - (first_match / len(content)) if first_match != -1 else 0.0
+        position_score = 1.0 - (positions[0] / len(memo.content)) if positions else 0.0
         
         # Combine scores
         raw_score = match_count + title_bonus + tag_bonus + position_score
@@ -387,26 +1167,32 @@ class EnhancedMemos:
         # Normalize to 0-1 range
         return min(1.0, raw_score / 10.0)
     
-    def _generate_smart_summary(self, memo: Dict[str, Any], query: str = "", max_length: int = 500) -> str:
+    def _generate_smart_summary(self, memo: Memo, query: str = "", max_length: int = 500,
+                                lines: Optional[List[str]] = None,
+                                positions: Optional[List[int]] = None) -> str:
         """
         Generate intelligent summary of memo content.
         
         Args:
-            memo: The memo object
+            memo: The memo view
             query: Search query (if any)
             max_length: Maximum summary length
+            lines: Content already split into lines, if available
+            positions: Precomputed match offsets from _find_all_positions
             
         Returns:
             Smart summary of the memo
         """
-        content = memo.get("content", "")
+        content = memo.content
         
         if not content:
             return ""
         
         # If there's a query, prioritize snippets around matches
         if query:
-            snippets = self._extract_snippet_around_match(content, query)
+            snippets = self._extract_snippet_around_match(
+                memo, query, positions=positions[:3] if positions is not None else None
+            )
             if snippets:
                 # Join top snippets
                 summary = " [...] ".join(snippets[:3])
@@ -415,7 +1201,8 @@ class EnhancedMemos:
                 return summary
         
         # Otherwise, create a general summary
-        lines = content.split('\n')
+        if lines is None:
+            lines = content.split('\n')
         summary_parts = []
         
         # Always include the title/first line
@@ -425,29 +1212,35 @@ class EnhancedMemos:
         # Include important sections (headers, lists)
         remaining_length = max_length - len(summary_parts[0]) if summary_parts else max_length
         
+        # Length of the parts joined by single separators, kept as they are added
+        joined_length = len(summary_parts[0]) if summary_parts else 0
+        
         for line in lines[1:]:
             line = line.strip()
             if not line:
                 continue
             
             # Prioritize headers and list items
-            if line.startswith('#') or line.startswith('-') or line.startswith('*') or line.startswith('1.'):
-                if len(' '.join(summary_parts)) + len(line) < remaining_length:
+            if _BULLET_RE.match(line):
+                if joined_length + len(line) < remaining_length:
                     summary_parts.append(line)
+                    joined_length += len(line) + 1
         
-        # If still under limit, add regular content
-        if len(' '.join(summary_parts)) < max_length * 0.7:
+        # If still under limit, add regular content, including lines like
+        # '#tag' or '-item' that start like headers and list items but are not
+        if joined_length < max_length * 0.7:
             for line in lines[1:]:
                 line = line.strip()
-                if line and not line.startswith('#') and not line.startswith('-'):
-                    if len(' '.join(summary_parts)) + len(line) < remaining_length:
+                if line and not _BULLET_RE.match(line):
+                    if joined_length + len(line) < remaining_length:
                         summary_parts.append(line)
+                        joined_length += len(line) + 1
         
         summary = '\n'.join(summary_parts)
         
         # Truncate if needed
         if len(summary) > max_length:
-            summary = summary[:max_length].rsplit(' ', 1)[0] + "..."
+            summary = _truncate_at_word(summary, max_length) + "..."
         
         return summary
     
@@ -488,29 +1281,80 @@ class EnhancedMemos:
         response = self.search_memos_enhanced(params)
         return response.memos
     
-    def get_memos_by_tag(self, tag: str, limit: int = 10) -> List[Dict[str, Any]]:
+    def get_memos_by_tag(self, tag: str, limit: int = 10,
+                         response_format: ResponseFormat = ResponseFormat.SUMMARY,
+                         content_max_length: int = 500) -> List[Dict[str, Any]]:
         """
         Get memos that contain a specific tag with enhanced filtering.
         
         Args:
             tag: The tag to search for (with or without #)
             limit: Maximum number of memos to return (default: 10)
+            response_format: Format for the returned memos (default: summary)
+            content_max_length: Maximum content length for summaries
             
         Returns:
-            A list of memo objects containing the tag
+            A list of memo objects containing the tag, newest first
+            
+        Raises:
+            MemosException: If there is an error fetching memos
         """
-        # Normalize the tag - add # if not present
-        if not tag.startswith("#"):
-            tag = f"#{tag}"
-        
-        params = EnhancedMemosSearchParams(
+        params = self._tag_params(tag, limit, response_format, content_max_length)
+        try:
+            cache = self._refresh_cache()
+        except (requests.RequestException, ValueError) as e:
+            raise MemosException(f"Error searching memos: {e}")
+        return self._memos_by_tag(cache, params)
+    
+    async def aget_memos_by_tag(self, tag: str, limit: int = 10,
+                                response_format: ResponseFormat = ResponseFormat.SUMMARY,
+                                content_max_length: int = 500) -> List[Dict[str, Any]]:
+        """Async version of get_memos_by_tag."""
+        params = self._tag_params(tag, limit, response_format, content_max_length)
+        try:
+            cache = await self._arefresh_cache()
+        except (httpx.HTTPError, ValueError) as e:
+            raise MemosException(f"Error searching memos: {e}")
+        return self._memos_by_tag(cache, params)
+    
+    def _tag_params(self, tag: str, limit: int, response_format: ResponseFormat,
+                    content_max_length: int) -> EnhancedMemosSearchParams:
+        """Build the search parameters for a single-tag lookup."""
+        return EnhancedMemosSearchParams(
             query="",
             limit=limit,
-            tags_filter=[tag.replace("#", "")],  # API uses tags without #
-            response_format=ResponseFormat.SUMMARY
+            tags_filter=[_normalize_tag(tag)[1]],  # API uses tags without #
+            response_format=response_format,
+            content_max_length=content_max_length
         )
-        response = self.search_memos_enhanced(params)
-        return response.memos
+    
+    def _memos_by_tag(self, cache: Dict[str, Any], params: EnhancedMemosSearchParams) -> List[Dict[str, Any]]:
+        """
+        Look up the newest memos carrying a tag in the inverted tag index.
+        
+        Uses the full cached index rather than a server-filtered fetch,
+        so only the tag's own memos are visited and the resulting IDs can
+        be memoized on the index until it is rebuilt or written to.
+        
+        Args:
+            cache: Memo index built by _build_index
+            params: Parameters from _tag_params
+            
+        Returns:
+            Formatted memos, newest first
+        """
+        by_id = cache["by_id"]
+        key = (params.tags_filter[0], params.limit)
+        memo_ids = cache["tag_pages"].get(key)
+        if memo_ids is None:
+            newest = heapq.nlargest(
+                params.limit,
+                ((by_id[memo_id].create_time, memo_id) for memo_id in cache["by_tag"].get(key[0], ()))
+            )
+            memo_ids = cache["tag_pages"][key] = [memo_id for _, memo_id in newest]
+        
+        format_memo = self._formatters[params.response_format]
+        return [format_memo(by_id[memo_id], params, "") for memo_id in memo_ids]
     
     # Keep all other methods unchanged for backward compatibility
     def create_memo(self, content: str, tags: List[str] = None) -> Dict[str, Any]:
@@ -527,29 +1371,23 @@ class EnhancedMemos:
         Raises:
             MemosException: If there is an error creating the memo
         """
-        # Format content to include tags
-        formatted_content = content
-        if tags:
-            # Append tags to the end of content
-            formatted_content += "\n\n" + " ".join(tags)
-        
-        # Prepare payload
+        # Prepare payload, with tags appended to the content
         payload = {
-            "content": formatted_content,
+            "content": _with_tags(content, tags),
             "visibility": "PRIVATE",  # Default to private memos
         }
         
         try:
-            response = requests.post(
-                f"{self.memos_url}/api/v1/memos", headers=self.headers, json=payload
-            )
+            response = self.session.post(f"{self.memos_url}/api/v1/memos", data=_encode_body(payload))
             response.raise_for_status()
             
             if response.status_code in [200, 201]:
-                return response.json()
+                memo = _loads(response.content)
+                self._index_add(memo)
+                return memo
             else:
                 raise MemosException(f"Error creating memo: {response.status_code}")
-        except requests.RequestException as e:
+        except (requests.RequestException, ValueError) as e:
             raise MemosException(f"Error creating memo: {e}")
     
     def get_memo_by_id(self, memo_id: str) -> Dict[str, Any]:
@@ -565,26 +1403,42 @@ class EnhancedMemos:
         Raises:
             MemosException: If there is an error retrieving the memo
         """
-        # Handle both full name format and short ID format
-        if memo_id.startswith("memos/"):
-            memo_name = memo_id.split("/")[1]
-        else:
-            memo_name = memo_id
+        memo_name = _normalize_memo_id(memo_id)
+        cached = self._cached_memo(memo_name)
+        if cached is not None:
+            return cached
         
         try:
-            response = requests.get(
-                f"{self.memos_url}/api/v1/memos/{memo_name}",
-                headers=self.headers,
-            )
+            response = self.session.get(f"{self.memos_url}/api/v1/memos/{memo_name}")
             response.raise_for_status()
             
             if response.status_code == 200:
-                return response.json()
+                return _loads(response.content)
             else:
                 raise MemosException(f"Error getting memo: {response.status_code}")
-        except requests.RequestException as e:
+        except (requests.RequestException, ValueError) as e:
             raise MemosException(f"Error getting memo: {e}")
     
+    def _cached_memo(self, memo_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a memo in the cached index while it is within its TTL.
+        
+        The index is kept current on writes, so a hit is as fresh as the
+        rest of the cache.
+        
+        Args:
+            memo_name: Short memo ID ('XXX')
+            
+        Returns:
+            A deep copy of the raw memo object, or None if it has to be fetched
+        """
+        if not self._cache_is_fresh():
+            return None
+        memo = self._cache["by_id"].get(f"memos/{memo_name}")
+        # Deep-copied so callers cannot modify the indexed memo or its
+        # tags, resources and other nested lists
+        return copy.deepcopy(memo.raw) if memo is not None else None
+    
     def update_memo(self, memo_id: str, content: str, tags: List[str] = []) -> Dict[str, Any]:
         """
         Update an existing memo.
@@ -600,36 +1454,27 @@ class EnhancedMemos:
         Raises:
             MemosException: If there is an error updating the memo
         """
-        # Handle both full name format and short ID format
-        if memo_id.startswith("memos/"):
-            memo_name = memo_id.split("/")[1]
-        else:
-            memo_name = memo_id
-        
-        # Format content to include tags
-        formatted_content = content
-        if tags:
-            # Append tags to the end of content
-            formatted_content += "\n\n" + " ".join(tags)
+        memo_name = _normalize_memo_id(memo_id)
         
-        # Prepare payload
+        # Prepare payload, with tags appended to the content
         payload = {
-            "content": formatted_content,
+            "content": _with_tags(content, tags),
         }
         
         try:
-            response = requests.patch(
+            response = self.session.patch(
                 f"{self.memos_url}/api/v1/memos/{memo_name}",
-                headers=self.headers,
-                json=payload,
+                data=_encode_body(payload),
             )
             response.raise_for_status()
             
             if response.status_code == 200:
-                return response.json()
+                memo = _loads(response.content)
+                self._index_add(memo)
+                return memo
             else:
                 raise MemosException(f"Error updating memo: {response.status_code}")
-        except requests.RequestException as e:
+        except (requests.RequestException, ValueError) as e:
             raise MemosException(f"Error updating memo: {e}")
     
     def delete_memo(self, memo_id: str) -> Dict[str, Any]:
@@ -645,22 +1490,123 @@ class EnhancedMemos:
         Raises:
             MemosException: If there is an error deleting the memo
         """
-        # Handle both full name format and short ID format
-        if memo_id.startswith("memos/"):
-            memo_name = memo_id.split("/")[1]
-        else:
-            memo_name = memo_id
+        memo_name = _normalize_memo_id(memo_id)
+        
+        try:
+            response = self.session.delete(f"{self.memos_url}/api/v1/memos/{memo_name}")
+            response.raise_for_status()
+            
+            if response.status_code == 200:
+                self._index_remove(f"memos/{memo_name}")
+                return {"message": f"Memo {memo_id} deleted successfully"}
+            else:
+                raise MemosException(f"Error deleting memo: {response.status_code}")
+        except (requests.RequestException, ValueError) as e:
+            raise MemosException(f"Error deleting memo: {e}")
+    
+    async def acreate_memo(self, content: str, tags: List[str] = None) -> Dict[str, Any]:
+        """Async version of create_memo."""
+        payload = {
+            "content": _with_tags(content, tags),
+            "visibility": "PRIVATE",  # Default to private memos
+        }
+        
+        try:
+            response = await self._aclient.post(f"{self.memos_url}/api/v1/memos", content=_encode_body(payload))
+            response.raise_for_status()
+            
+            if response.status_code in [200, 201]:
+                memo = _loads(response.content)
+                self._index_add(memo)
+                return memo
+            else:
+                raise MemosException(f"Error creating memo: {response.status_code}")
+        except (httpx.HTTPError, ValueError) as e:
+            raise MemosException(f"Error creating memo: {e}")
+    
+    async def aget_memo_by_id(self, memo_id: str) -> Dict[str, Any]:
+        """Async version of get_memo_by_id."""
+        memo_name = _normalize_memo_id(memo_id)
+        cached = self._cached_memo(memo_name)
+        if cached is not None:
+            return cached
         
         try:
-            response = requests.delete(
+            response = await self._aclient.get(f"{self.memos_url}/api/v1/memos/{memo_name}")
+            response.raise_for_status()
+            
+            if response.status_code == 200:
+                return _loads(response.content)
+            else:
+                raise MemosException(f"Error getting memo: {response.status_code}")
+        except (httpx.HTTPError, ValueError) as e:
+            raise MemosException(f"Error getting memo: {e}")
+    
+    async def aget_memos_by_ids(self, memo_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Get several memos by ID with concurrent requests.
+        
+        Args:
+            memo_ids: Memo IDs (full names like 'memos/XXX' or just 'XXX')
+            
+        Returns:
+            One entry per ID, in input order: the memo object, or
+            {"id": ..., "error": ...} if that memo could not be retrieved
+        """
+        # Cached memos resolve without a request; the rest share the
+        # async client's pool (one multiplexed connection over HTTP/2)
+        results = await asyncio.gather(
+            *(self.aget_memo_by_id(memo_id) for memo_id in memo_ids),
+            return_exceptions=True
+        )
+        
+        # A failed lookup is reported in its own entry; only cancellation
+        # (a BaseException) propagates
+        memos = []
+        for memo_id, result in zip(memo_ids, results):
+            if isinstance(result, Exception):
+                memos.append({"id": memo_id, "error": str(result)})
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                memos.append(result)
+        return memos
+    
+    async def aupdate_memo(self, memo_id: str, content: str, tags: List[str] = []) -> Dict[str, Any]:
+        """Async version of update_memo."""
+        memo_name = _normalize_memo_id(memo_id)
+        payload = {
+            "content": _with_tags(content, tags),
+        }
+        
+        try:
+            response = await self._aclient.patch(
                 f"{self.memos_url}/api/v1/memos/{memo_name}",
-                headers=self.headers,
+                content=_encode_body(payload),
             )
             response.raise_for_status()
             
             if response.status_code == 200:
+                memo = _loads(response.content)
+                self._index_add(memo)
+                return memo
+            else:
+                raise MemosException(f"Error updating memo: {response.status_code}")
+        except (httpx.HTTPError, ValueError) as e:
+            raise MemosException(f"Error updating memo: {e}")
+    
+    async def adelete_memo(self, memo_id: str) -> Dict[str, Any]:
+        """Async version of delete_memo."""
+        memo_name = _normalize_memo_id(memo_id)
+        
+        try:
+            response = await self._aclient.delete(f"{self.memos_url}/api/v1/memos/{memo_name}")
+            response.raise_for_status()
+            
+            if response.status_code == 200:
+                self._index_remove(f"memos/{memo_name}")
                 return {"message": f"Memo {memo_id} deleted successfully"}
             else:
                 raise MemosException(f"Error deleting memo: {response.status_code}")
-        except requests.RequestException as e:
-            raise MemosException(f"Error deleting memo: {e}")
\ No newline at end of file
+        except (httpx.HTTPError, ValueError) as e:
+            raise MemosException(f"Error deleting memo: {e}")
@@ -157,10 +157,8 @@ def create_memo(content: str, tags: List[str] = []) -> Dict[str, Any]:
     Returns:
         The created memo object
     """
-    # Make sure default tag is included
-    tags_with_default = list(tags)
-    if DEFAULT_TAG not in tags_with_default:
-        tags_with_default.append(DEFAULT_TAG)
+    # Make sure default tag is included, dropping duplicate tags
+    tags_with_default = list(dict.fromkeys((*tags, DEFAULT_TAG)))
 
     try:
         return memos_client.create_memo(content, tags_with_default)
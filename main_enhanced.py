@@ -1,4 +1,8 @@
 from typing import Any, List, Dict, Optional
+from contextlib import asynccontextmanager
+from types import MappingProxyType
+import asyncio
+import functools
 import os
 from mcp.server.fastmcp import FastMCP
 from mcp.shared.exceptions import McpError
@@ -8,29 +12,71 @@ from mcp.types import (
 )
 from enhanced_memos import EnhancedMemos, EnhancedMemosSearchParams, ResponseFormat, MemosException
 
+@asynccontextmanager
+async def lifespan(server: FastMCP):
+    """Close the client's pooled connections when the server shuts down."""
+    try:
+        yield
+    finally:
+        if _client.cache_info().currsize:
+            await _client().aclose()
+            _client().close()
+
+
 # Initialize FastMCP server
-mcp = FastMCP("memos")
+mcp = FastMCP("memos", lifespan=lifespan)
 
 # Constants
-MEMOS_URL = os.getenv("MEMOS_URL")
-MEMOS_API_KEY = os.getenv("MEMOS_ACCESS_TOKEN") or os.getenv("MEMOS_API_KEY")
 DEFAULT_TAG = os.getenv("DEFAULT_TAG", "#MCP")  # Default to #MCP if not set
 
-# Validate environment variables
-if not MEMOS_URL:
-    raise ValueError("MEMOS_URL environment variable is required")
-if not MEMOS_API_KEY:
-    raise ValueError("MEMOS_ACCESS_TOKEN or MEMOS_API_KEY environment variable is required")
+# Per-tool result caps
+_MAX_SEARCH_LIMIT = 50
+_MAX_LATEST_LIMIT = 20
+_MAX_TAG_LIMIT = 20
+
+# Response format names accepted by the tools (read-only, built once)
+_FORMAT_MAP = MappingProxyType({
+    "id_only": ResponseFormat.ID_ONLY,
+    "minimal": ResponseFormat.MINIMAL,
+    "summary": ResponseFormat.SUMMARY,
+    "full": ResponseFormat.FULL
+})
+# Listing tools (latest, by tag) do not offer id_only
+_LIST_FORMAT_MAP = MappingProxyType({
+    name: response_format for name, response_format in _FORMAT_MAP.items()
+    if response_format != ResponseFormat.ID_ONLY
+})
 
-# Initialize Enhanced Memos client
-memos_client = EnhancedMemos(MEMOS_URL, MEMOS_API_KEY)
+
+@functools.lru_cache(maxsize=1)
+def _client() -> EnhancedMemos:
+    """
+    Create the Enhanced Memos client on first use.
+    
+    Deferring this keeps importing the server (e.g. for tool discovery)
+    free of configuration checks and client setup.
+    
+    Raises:
+        ValueError: If a required environment variable is missing
+    """
+    memos_url = os.getenv("MEMOS_URL")
+    memos_api_key = os.getenv("MEMOS_ACCESS_TOKEN") or os.getenv("MEMOS_API_KEY")
+    
+    # Validate environment variables
+    if not memos_url:
+        raise ValueError("MEMOS_URL environment variable is required")
+    if not memos_api_key:
+        raise ValueError("MEMOS_ACCESS_TOKEN or MEMOS_API_KEY environment variable is required")
+    
+    return EnhancedMemos(memos_url, memos_api_key)
 
 
 @mcp.tool()
-def search_memos_enhanced(
+async def search_memos_enhanced(
     query: str = "",
     limit: int = 10,
     offset: int = 0,
+    cursor: Optional[str] = None,
     response_format: str = "summary",
     content_max_length: int = 500,
     date_from: Optional[str] = None,
@@ -43,7 +89,8 @@ def search_memos_enhanced(
     Args:
         query: Search query string (optional)
         limit: Number of results to return (default: 10, max: 50)
-        offset: Number of results to skip (default: 0)
+        offset: Number of results to skip (default: 0, deprecated in favor of cursor)
+        cursor: Cursor from a previous response's next_cursor to fetch the next page
         response_format: Format for responses - 'id_only', 'minimal', 'summary', 'full' (default: 'summary')
         content_max_length: Maximum content length for summaries (default: 500)
         date_from: Filter memos created after this date (ISO format)
@@ -56,50 +103,143 @@ def search_memos_enhanced(
         - total_count: Total number of matching memos
         - has_more: Whether more results are available
         - next_offset: Offset for next page (-1 if no more)
+        - next_cursor: Cursor for next page (null if no more)
         - query_metadata: Information about the query
     """
     try:
-        # Convert string format to enum
-        format_map = {
-            "id_only": ResponseFormat.ID_ONLY,
-            "minimal": ResponseFormat.MINIMAL,
-            "summary": ResponseFormat.SUMMARY,
-            "full": ResponseFormat.FULL
-        }
-        format_enum = format_map.get(response_format.lower(), ResponseFormat.SUMMARY)
-        
-        # Create enhanced parameters
-        params = EnhancedMemosSearchParams(
+        params = _search_params(
             query=query,
-            limit=min(limit, 50),  # Cap at 50
+            limit=limit,
             offset=offset,
-            response_format=format_enum,
+            cursor=cursor,
+            response_format=response_format,
             content_max_length=content_max_length,
             date_from=date_from,
             date_to=date_to,
-            tags_filter=tags_filter or [],
-            summary_only=format_enum == ResponseFormat.SUMMARY
+            tags_filter=tags_filter
         )
         
         # Execute enhanced search
-        response = memos_client.search_memos_enhanced(params)
+        response = await _client().asearch_memos_enhanced(params)
         
         # Return structured response
-        return {
-            "memos": response.memos,
-            "total_count": response.total_count,
-            "has_more": response.has_more,
-            "next_offset": response.next_offset,
-            "query_metadata": response.query_metadata
-        }
+        return response.to_dict()
         
     except MemosException as e:
         raise McpError(ErrorData(code=INTERNAL_ERROR, message=str(e)))
 
 
+def _clamp(limit: int, cap: int) -> int:
+    """Cap a requested result count at a tool's maximum."""
+    return limit if limit < cap else cap
+
+
+def _search_params(
+    query: str = "",
+    limit: int = 10,
+    offset: int = 0,
+    cursor: Optional[str] = None,
+    response_format: str = "summary",
+    content_max_length: int = 500,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    tags_filter: Optional[List[str]] = None
+) -> EnhancedMemosSearchParams:
+    """Build enhanced search parameters from search_memos_enhanced tool arguments."""
+    # Convert string format to enum
+    format_enum = _FORMAT_MAP.get(response_format.lower(), ResponseFormat.SUMMARY)
+    
+    return EnhancedMemosSearchParams(
+        query=query,
+        limit=_clamp(limit, _MAX_SEARCH_LIMIT),
+        offset=offset,
+        cursor=cursor,
+        response_format=format_enum,
+        content_max_length=content_max_length,
+        date_from=date_from,
+        date_to=date_to,
+        tags_filter=tags_filter or [],
+        summary_only=format_enum == ResponseFormat.SUMMARY
+    )
+
+
+# Accepted search_memos_batch spec keys and their types (None allowed where listed)
+_SEARCH_SPEC_TYPES = MappingProxyType({
+    "query": (str,),
+    "limit": (int,),
+    "offset": (int,),
+    "cursor": (str, type(None)),
+    "response_format": (str,),
+    "content_max_length": (int,),
+    "date_from": (str, type(None)),
+    "date_to": (str, type(None)),
+    "tags_filter": (list, type(None)),
+})
+
+
+def _validate_search_spec(spec: Any) -> None:
+    """
+    Check a search_memos_batch spec before building parameters from it.
+    
+    Raises:
+        MemosException: If the spec is not a dict, has unknown keys or has
+            a value of the wrong type
+    """
+    if not isinstance(spec, dict):
+        raise MemosException(f"Invalid search spec: expected an object, got {type(spec).__name__}")
+    for key, value in spec.items():
+        types = _SEARCH_SPEC_TYPES.get(key)
+        if types is None:
+            raise MemosException(f"Invalid search spec: unknown argument '{key}'")
+        # bool is an int subclass but never a valid count
+        if not isinstance(value, types) or (isinstance(value, bool) and bool not in types):
+            raise MemosException(f"Invalid search spec: '{key}' has type {type(value).__name__}")
+    tags_filter = spec.get("tags_filter")
+    if tags_filter is not None and not all(isinstance(tag, str) for tag in tags_filter):
+        raise MemosException("Invalid search spec: 'tags_filter' must be a list of strings")
+
+
+@mcp.tool()
+async def search_memos_batch(queries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Run several enhanced searches concurrently in one tool call.
+    
+    Args:
+        queries: List of search specs, each a dict with any of the
+            search_memos_enhanced arguments (query, limit, offset, cursor,
+            response_format, content_max_length, date_from, date_to, tags_filter)
+        
+    Returns:
+        One entry per query, in input order, containing:
+        - index: Position of the query in the input list
+        - result: The search_memos_enhanced result, if the search succeeded
+        - error: The error message, if it failed
+    """
+    async def run(spec: Dict[str, Any]) -> Dict[str, Any]:
+        _validate_search_spec(spec)
+        params = _search_params(**spec)
+        response = await _client().asearch_memos_enhanced(params)
+        return response.to_dict()
+    
+    # Searches share the client's cached index and connection pool; a
+    # failing query is reported in its own entry without aborting the rest;
+    # only cancellation (a BaseException) propagates
+    results = await asyncio.gather(*(run(spec) for spec in queries), return_exceptions=True)
+    
+    batch = []
+    for index, result in enumerate(results):
+        if isinstance(result, Exception):
+            batch.append({"index": index, "error": str(result)})
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            batch.append({"index": index, "result": result})
+    return batch
+
+
 # Keep backward compatible search_memos
 @mcp.tool()
-def search_memos(query: str) -> List[Dict[str, Any]]:
+async def search_memos(query: str) -> List[Dict[str, Any]]:
     """
     Search memos using the Memos API (backward compatible).
     
@@ -116,14 +256,14 @@ def search_memos(query: str) -> List[Dict[str, Any]]:
             limit=20,
             response_format=ResponseFormat.FULL
         )
-        response = memos_client.search_memos_enhanced(params)
+        response = await _client().asearch_memos_enhanced(params)
         return response.memos
     except MemosException as e:
         raise McpError(ErrorData(code=INTERNAL_ERROR, message=str(e)))
 
 
 @mcp.tool()
-def get_latest_memos(limit: int = 3, response_format: str = "summary") -> List[Dict[str, Any]]:
+async def get_latest_memos(limit: int = 3, response_format: str = "summary") -> List[Dict[str, Any]]:
     """
     Get the latest memos with enhanced formatting options.
     
@@ -134,17 +274,11 @@ def get_latest_memos(limit: int = 3, response_format: str = "summary") -> List[D
     Returns:
         A list of the latest memo objects
     """
-    if limit > 20:
-        limit = 20
+    limit = _clamp(limit, _MAX_LATEST_LIMIT)
     
     try:
         # Use enhanced search for latest memos
-        format_map = {
-            "minimal": ResponseFormat.MINIMAL,
-            "summary": ResponseFormat.SUMMARY,
-            "full": ResponseFormat.FULL
-        }
-        format_enum = format_map.get(response_format.lower(), ResponseFormat.SUMMARY)
+        format_enum = _LIST_FORMAT_MAP.get(response_format.lower(), ResponseFormat.SUMMARY)
         
         params = EnhancedMemosSearchParams(
             query="",
@@ -152,14 +286,14 @@ def get_latest_memos(limit: int = 3, response_format: str = "summary") -> List[D
             response_format=format_enum,
             content_max_length=300  # Shorter for latest memos
         )
-        response = memos_client.search_memos_enhanced(params)
+        response = await _client().asearch_memos_enhanced(params)
         return response.memos
     except MemosException as e:
         raise McpError(ErrorData(code=INTERNAL_ERROR, message=str(e)))
 
 
 @mcp.tool()
-def get_memos_by_tag(tag: str, limit: int = 10, response_format: str = "summary") -> List[Dict[str, Any]]:
+async def get_memos_by_tag(tag: str, limit: int = 10, response_format: str = "summary") -> List[Dict[str, Any]]:
     """
     Get memos that contain a specific tag with enhanced formatting.
     
@@ -171,37 +305,20 @@ def get_memos_by_tag(tag: str, limit: int = 10, response_format: str = "summary"
     Returns:
         A list of memo objects containing the tag
     """
-    if limit > 20:
-        limit = 20
+    limit = _clamp(limit, _MAX_TAG_LIMIT)
     
     try:
-        # Normalize tag
-        if not tag.startswith("#"):
-            tag = f"#{tag}"
-            
-        format_map = {
-            "minimal": ResponseFormat.MINIMAL,
-            "summary": ResponseFormat.SUMMARY,
-            "full": ResponseFormat.FULL
-        }
-        format_enum = format_map.get(response_format.lower(), ResponseFormat.SUMMARY)
+        format_enum = _LIST_FORMAT_MAP.get(response_format.lower(), ResponseFormat.SUMMARY)
         
-        params = EnhancedMemosSearchParams(
-            query="",
-            limit=limit,
-            tags_filter=[tag.replace("#", "")],
-            response_format=format_enum,
-            content_max_length=400
-        )
-        response = memos_client.search_memos_enhanced(params)
-        return response.memos
+        # Served from the client's tag index, memoized per (tag, limit)
+        return await _client().aget_memos_by_tag(tag, limit, format_enum, content_max_length=400)
     except MemosException as e:
         raise McpError(ErrorData(code=INTERNAL_ERROR, message=str(e)))
 
 
 # Keep all other methods unchanged for backward compatibility
 @mcp.tool()
-def get_memo_by_id(memo_id: str) -> Dict[str, Any]:
+async def get_memo_by_id(memo_id: str) -> Dict[str, Any]:
     """
     Get a specific memo by its ID.
     
@@ -212,13 +329,28 @@ def get_memo_by_id(memo_id: str) -> Dict[str, Any]:
         The memo object with full details
     """
     try:
-        return memos_client.get_memo_by_id(memo_id)
+        return await _client().aget_memo_by_id(memo_id)
     except MemosException as e:
         raise McpError(ErrorData(code=INTERNAL_ERROR, message=str(e)))
 
 
 @mcp.tool()
-def update_memo(memo_id: str, content: str, tags: List[str] = []) -> Dict[str, Any]:
+async def get_memos_by_ids_batch(memo_ids: List[str]) -> List[Dict[str, Any]]:
+    """
+    Get several memos by their IDs in one call.
+    
+    Args:
+        memo_ids: The memo IDs (each can be a full name like 'memos/XXX' or just 'XXX')
+        
+    Returns:
+        One entry per ID, in input order: the memo object, or an object
+        with "id" and "error" if that memo could not be retrieved
+    """
+    return await _client().aget_memos_by_ids(memo_ids)
+
+
+@mcp.tool()
+async def update_memo(memo_id: str, content: str, tags: List[str] = []) -> Dict[str, Any]:
     """
     Update an existing memo.
     
@@ -231,13 +363,13 @@ def update_memo(memo_id: str, content: str, tags: List[str] = []) -> Dict[str, A
         The updated memo object
     """
     try:
-        return memos_client.update_memo(memo_id, content, tags)
+        return await _client().aupdate_memo(memo_id, content, tags)
     except MemosException as e:
         raise McpError(ErrorData(code=INTERNAL_ERROR, message=str(e)))
 
 
 @mcp.tool()
-def delete_memo(memo_id: str) -> Dict[str, Any]:
+async def delete_memo(memo_id: str) -> Dict[str, Any]:
     """
     Delete a memo by its ID.
     
@@ -248,13 +380,13 @@ def delete_memo(memo_id: str) -> Dict[str, Any]:
         A success message
     """
     try:
-        return memos_client.delete_memo(memo_id)
+        return await _client().adelete_memo(memo_id)
     except MemosException as e:
         raise McpError(ErrorData(code=INTERNAL_ERROR, message=str(e)))
 
 
 @mcp.tool()
-def create_memo(content: str, tags: List[str] = []) -> Dict[str, Any]:
+async def create_memo(content: str, tags: List[str] = []) -> Dict[str, Any]:
     """
     Create a new memo with the Memos API.
     
@@ -265,13 +397,11 @@ def create_memo(content: str, tags: List[str] = []) -> Dict[str, Any]:
     Returns:
         The created memo object
     """
-    # Make sure default tag is included
-    tags_with_default = list(tags)
-    if DEFAULT_TAG not in tags_with_default:
-        tags_with_default.append(DEFAULT_TAG)
+    # Make sure default tag is included, dropping duplicate tags
+    tags_with_default = list(dict.fromkeys((*tags, DEFAULT_TAG)))
     
     try:
-        return memos_client.create_memo(content, tags_with_default)
+        return await _client().acreate_memo(content, tags_with_default)
     except MemosException as e:
         raise McpError(ErrorData(code=INTERNAL_ERROR, message=str(e)))
 
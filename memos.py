@@ -1,5 +1,49 @@
+import json
+import re
 import requests
-from typing import List, Dict, Any
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import List, Dict, Any, Tuple
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # optional streaming parser
+    ijson = None
+
+# Decode response bodies with orjson when it is installed
+_loads = orjson.loads if orjson else json.loads
+
+
+def _encode_body(payload: Dict[str, Any]) -> bytes:
+    """Encode a request body as JSON bytes, with orjson when it is installed."""
+    if orjson:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode()
+
+# A tag with an optional leading #
+_TAG_RE = re.compile(r"#?([^\s#]+)")
+
+
+def _normalize_tag(tag: str) -> Tuple[str, str]:
+    """
+    Normalize a tag given with or without its leading #.
+
+    Returns:
+        The tag as ("#name", "name")
+    """
+    match = _TAG_RE.fullmatch(tag)
+    name = match.group(1) if match else tag.replace("#", "")
+    return f"#{name}", name
+
+
+def _memo_name(memo_id: str) -> str:
+    """Accept both full name format ("memos/123") and short ID format ("123")."""
+    return memo_id.removeprefix("memos/")
 
 
 class MemosException(Exception):
@@ -25,32 +69,62 @@ class Memos:
             "Content-Type": "application/json",
         }
 
+        # Persistent session so calls reuse pooled keep-alive connections
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=(502, 503, 504)),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        # Whether the server accepts `filter=` on the memo list (None: unknown yet)
+        self._server_supports_filter = None
+        # Authenticated user, fetched on first get_user_id()
+        self._user_id = None
+
+    def close(self):
+        """Close the underlying HTTP session and its pooled connections."""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
     def get_user_id(self) -> str:
         """
         Get the user ID of the authenticated user by checking auth status.
 
+        The ID belongs to the API key, so it is fetched once per client.
+
         Returns:
             str: The user ID of the authenticated user
 
         Raises:
             MemosException: If there is an error retrieving the user ID
         """
+        if self._user_id is not None:
+            return self._user_id
+
         try:
             # Use the auth/status endpoint to get current user info
-            response = requests.get(
-                f"{self.memos_url}/api/v1/auth/status", headers=self.headers
-            )
+            response = self.session.get(f"{self.memos_url}/api/v1/auth/status")
             response.raise_for_status()
 
             # Extract the user ID from the response
-            user_data = response.json()
+            user_data = _loads(response.content)
             user_id = user_data.get("name")
 
             if not user_id:
                 raise MemosException("Could not retrieve user ID from auth status")
 
+            self._user_id = user_id
             return user_id
-        except requests.RequestException as e:
+        except (requests.RequestException, ValueError) as e:
             raise MemosException(f"Error getting user ID: {e}")
 
     def search_memos(self, query: str) -> List[Dict[str, Any]]:
@@ -67,23 +141,24 @@ class Memos:
             MemosException: If there is an error searching memos
         """
         try:
-            # Try the global memos endpoint first
-            response = requests.get(
+            # Fetch the full list: a server-side content.contains() filter
+            # compares case as the server's database does, and the
+            # case-insensitive check below cannot recover memos it drops
+            response = self.session.get(
                 f"{self.memos_url}/api/v1/memos",
-                headers=self.headers,
             )
             response.raise_for_status()
 
             if response.status_code == 200:
-                memos = response.json().get("memos", [])
+                memos = _loads(response.content).get("memos", [])
                 # Filter by query if provided
                 if query:
-                    filtered_memos = [memo for memo in memos if query.lower() in memo.get("content", "").lower()]
-                    return filtered_memos
+                    query_lower = query.lower()
+                    return [memo for memo in memos if query_lower in memo.get("content", "").lower()]
                 return memos
             else:
                 raise MemosException(f"Error searching memos: {response.status_code}")
-        except requests.RequestException as e:
+        except (requests.RequestException, ValueError) as e:
             raise MemosException(f"Error searching memos: {e}")
 
     def get_latest_memos(self, limit: int = 3) -> List[Dict[str, Any]]:
@@ -101,18 +176,17 @@ class Memos:
         """
         try:
             params = {"pageSize": limit}
-            response = requests.get(
+            response = self.session.get(
                 f"{self.memos_url}/api/v1/memos",
-                headers=self.headers,
                 params=params,
             )
             response.raise_for_status()
 
             if response.status_code == 200:
-                return response.json().get("memos", [])
+                return _loads(response.content).get("memos", [])
             else:
                 raise MemosException(f"Error getting latest memos: {response.status_code}")
-        except requests.RequestException as e:
+        except (requests.RequestException, ValueError) as e:
             raise MemosException(f"Error getting latest memos: {e}")
 
     def get_memo_by_id(self, memo_id: str) -> Dict[str, Any]:
@@ -128,24 +202,19 @@ class Memos:
         Raises:
             MemosException: If there is an error retrieving the memo
         """
-        # Handle both full name format and short ID format
-        if memo_id.startswith("memos/"):
-            memo_name = memo_id.split("/")[1]
-        else:
-            memo_name = memo_id
+        memo_name = _memo_name(memo_id)
 
         try:
-            response = requests.get(
+            response = self.session.get(
                 f"{self.memos_url}/api/v1/memos/{memo_name}",
-                headers=self.headers,
             )
             response.raise_for_status()
 
             if response.status_code == 200:
-                return response.json()
+                return _loads(response.content)
             else:
                 raise MemosException(f"Error getting memo: {response.status_code}")
-        except requests.RequestException as e:
+        except (requests.RequestException, ValueError) as e:
             raise MemosException(f"Error getting memo: {e}")
 
     def update_memo(self, memo_id: str, content: str, tags: List[str] = []) -> Dict[str, Any]:
@@ -163,11 +232,7 @@ class Memos:
         Raises:
             MemosException: If there is an error updating the memo
         """
-        # Handle both full name format and short ID format
-        if memo_id.startswith("memos/"):
-            memo_name = memo_id.split("/")[1]
-        else:
-            memo_name = memo_id
+        memo_name = _memo_name(memo_id)
 
         # Format content to include tags
         formatted_content = content
@@ -181,18 +246,17 @@ class Memos:
         }
 
         try:
-            response = requests.patch(
+            response = self.session.patch(
                 f"{self.memos_url}/api/v1/memos/{memo_name}",
-                headers=self.headers,
-                json=payload,
+                data=_encode_body(payload),
             )
             response.raise_for_status()
 
             if response.status_code == 200:
-                return response.json()
+                return _loads(response.content)
             else:
                 raise MemosException(f"Error updating memo: {response.status_code}")
-        except requests.RequestException as e:
+        except (requests.RequestException, ValueError) as e:
             raise MemosException(f"Error updating memo: {e}")
 
     def delete_memo(self, memo_id: str) -> Dict[str, Any]:
@@ -208,16 +272,11 @@ class Memos:
         Raises:
             MemosException: If there is an error deleting the memo
         """
-        # Handle both full name format and short ID format
-        if memo_id.startswith("memos/"):
-            memo_name = memo_id.split("/")[1]
-        else:
-            memo_name = memo_id
+        memo_name = _memo_name(memo_id)
 
         try:
-            response = requests.delete(
+            response = self.session.delete(
                 f"{self.memos_url}/api/v1/memos/{memo_name}",
-                headers=self.headers,
             )
             response.raise_for_status()
 
@@ -225,7 +284,7 @@ class Memos:
                 return {"message": f"Memo {memo_id} deleted successfully"}
             else:
                 raise MemosException(f"Error deleting memo: {response.status_code}")
-        except requests.RequestException as e:
+        except (requests.RequestException, ValueError) as e:
             raise MemosException(f"Error deleting memo: {e}")
 
     def get_memos_by_tag(self, tag: str, limit: int = 10) -> List[Dict[str, Any]]:
@@ -242,41 +301,94 @@ class Memos:
         Raises:
             MemosException: If there is an error getting memos
         """
-        # Normalize the tag - add # if not present
-        if not tag.startswith("#"):
-            tag = f"#{tag}"
+        tag, tag_name = _normalize_tag(tag)
 
         try:
-            # Get all memos first (with a reasonable limit)
-            params = {"pageSize": min(limit * 5, 100)}  # Get more than needed to filter
-            response = requests.get(
-                f"{self.memos_url}/api/v1/memos",
-                headers=self.headers,
-                params=params,
-            )
+            if self._server_supports_filter is not False:
+                # Let the server return only the tagged memos
+                params = {"pageSize": limit, "filter": f"tag in [{json.dumps(tag_name)}]"}
+                response = self.session.get(
+                    f"{self.memos_url}/api/v1/memos",
+                    params=params,
+                )
+                if response.status_code != 400:
+                    response.raise_for_status()
+                    self._server_supports_filter = True
+                    return _loads(response.content).get("memos", [])[:limit]
+                # Older servers reject the filter syntax; filter client-side instead
+                self._server_supports_filter = False
+
+            return self._filter_memos_by_tag(tag, tag_name, limit)
+        except (requests.RequestException, ValueError) as e:
+            raise MemosException(f"Error getting memos by tag: {e}")
+
+    def _filter_memos_by_tag(self, tag: str, tag_name: str, limit: int) -> List[Dict[str, Any]]:
+        """
+        Find tagged memos client-side, for servers without filter support.
+
+        Args:
+            tag: The tag to search for, with #
+            tag_name: The tag without #
+            limit: Maximum number of memos to return
+
+        Returns:
+            A list of memo objects containing the tag
+
+        Raises:
+            MemosException: If the API returns an unexpected status
+            requests.RequestException: If the request fails
+        """
+        # Get all memos first (with a reasonable limit)
+        params = {"pageSize": min(limit * 5, 100)}  # Get more than needed to filter
+        with self.session.get(
+            f"{self.memos_url}/api/v1/memos",
+            params=params,
+            stream=True,
+        ) as response:
             response.raise_for_status()
 
-            if response.status_code == 200:
-                all_memos = response.json().get("memos", [])
-                # Filter memos that contain the tag
-                tagged_memos = []
-                for memo in all_memos:
-                    # Check if tag is in the tags array
-                    if tag.lstrip("#") in memo.get("tags", []):
-                        tagged_memos.append(memo)
-                    # Also check if tag appears in content
-                    elif tag in memo.get("content", ""):
-                        tagged_memos.append(memo)
-                    
-                    # Stop if we have enough
-                    if len(tagged_memos) >= limit:
-                        break
-                
-                return tagged_memos[:limit]
-            else:
+            if response.status_code != 200:
                 raise MemosException(f"Error getting memos by tag: {response.status_code}")
-        except requests.RequestException as e:
-            raise MemosException(f"Error getting memos by tag: {e}")
+
+            if ijson is None:
+                return self._match_tag(_loads(response.content).get("memos", []), tag, tag_name, limit)
+
+            # Parse memo by memo so parsing stops once enough have matched
+            response.raw.decode_content = True
+            try:
+                return self._match_tag(ijson.items(response.raw, "memos.item", use_float=True), tag, tag_name, limit)
+            except ijson.JSONError as e:
+                raise MemosException(f"Error getting memos by tag: {e}")
+
+    def _match_tag(self, memos, tag: str, tag_name: str, limit: int) -> List[Dict[str, Any]]:
+        """
+        Collect up to `limit` memos carrying a tag.
+
+        Args:
+            memos: Iterable of memo objects
+            tag: The tag to search for, with #
+            tag_name: The tag without #
+            limit: Maximum number of memos to return
+
+        Returns:
+            A list of memo objects containing the tag
+        """
+        # Filter memos that contain the tag
+        tagged_memos = []
+        for memo in memos:
+            # Check if tag is in the tags array (memos carry only a few tags,
+            # so a scan beats building a set for this single lookup)
+            if tag_name in (memo.get("tags") or ()):
+                tagged_memos.append(memo)
+            # Also check if tag appears in content
+            elif tag in memo.get("content", ""):
+                tagged_memos.append(memo)
+
+            # Stop if we have enough
+            if len(tagged_memos) >= limit:
+                break
+
+        return tagged_memos[:limit]
 
     def create_memo(self, content: str, tags: List[str] = []) -> Dict[str, Any]:
         """
@@ -305,14 +417,12 @@ class Memos:
         }
 
         try:
-            response = requests.post(
-                f"{self.memos_url}/api/v1/memos", headers=self.headers, json=payload
-            )
+            response = self.session.post(f"{self.memos_url}/api/v1/memos", data=_encode_body(payload))
             response.raise_for_status()
 
             if response.status_code in [200, 201]:
-                return response.json()
+                return _loads(response.content)
             else:
                 raise MemosException(f"Error creating memo: {response.status_code}")
-        except requests.RequestException as e:
+        except (requests.RequestException, ValueError) as e:
             raise MemosException(f"Error creating memo: {e}")
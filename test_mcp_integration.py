@@ -1,23 +1,42 @@
 #!/usr/bin/env python3
 """Test the enhanced MCP integration"""
 
-import json
-import os
 import sys
 from datetime import datetime
-from enhanced_memos import EnhancedMemos, EnhancedMemosSearchParams, ResponseFormat
+from enhanced_memos import EnhancedMemosSearchParams, ResponseFormat
+from test_utils import client_from_env, dumps_pretty, json_size
 
-def test_mcp_integration():
+
+# Search parameters used below, built once at import
+MCP_MINIMAL = EnhancedMemosSearchParams(
+    query="mcp",
+    limit=5,
+    offset=0,
+    response_format=ResponseFormat.MINIMAL,
+    content_max_length=100
+)
+LATEST_IDS = EnhancedMemosSearchParams(
+    query="",
+    limit=20,
+    response_format=ResponseFormat.ID_ONLY
+)
+TASK_SUMMARY = EnhancedMemosSearchParams(
+    query="task",
+    limit=3,
+    response_format=ResponseFormat.SUMMARY,
+    summary_only=True,
+    content_max_length=200
+)
+TEST_SUMMARY = EnhancedMemosSearchParams(
+    query="test",
+    limit=5,
+    response_format=ResponseFormat.SUMMARY
+)
+
+
+def test_mcp_integration(memos_client):
     """Test MCP-like function calls"""
-    # Get credentials
-    memos_url = os.getenv("MEMOS_URL", "https://memos.galatek.dev")
-    memos_api_key = os.getenv("MEMOS_API_KEY", "")
-    
-    if not memos_api_key:
-        print("Error: MEMOS_API_KEY not set")
-        return
-    
-    client = EnhancedMemos(memos_url, memos_api_key)
+    client = memos_client
     
     print("Testing Enhanced MCP Integration")
     print("=" * 60)
@@ -27,33 +46,21 @@ def test_mcp_integration():
     print("-" * 40)
     
     # Simulate MCP tool call
-    params = EnhancedMemosSearchParams(
-        query="mcp",
-        limit=5,
-        offset=0,
-        response_format=ResponseFormat.MINIMAL,
-        content_max_length=100
-    )
+    params = MCP_MINIMAL
     
     try:
         response = client.search_memos_enhanced(params)
         
-        # Format as MCP would return
-        mcp_response = {
-            "memos": response.memos,
-            "total_count": response.total_count,
-            "has_more": response.has_more,
-            "next_offset": response.next_offset,
-            "query_metadata": response.query_metadata
-        }
+        # Format as the MCP tool returns it
+        mcp_response = response.to_dict()
         
         print(f"Found {mcp_response['total_count']} memos")
         print(f"Returned {len(mcp_response['memos'])} memos")
-        print(f"Response size: {len(json.dumps(mcp_response))} chars")
+        print(f"Response size: {json_size(mcp_response):,} chars")
         
         if mcp_response['memos']:
             print("\nFirst result (minimal format):")
-            print(json.dumps(mcp_response['memos'][0], indent=2))
+            print(dumps_pretty(mcp_response['memos'][0]))
     except Exception as e:
         print(f"Error: {e}")
     
@@ -61,22 +68,14 @@ def test_mcp_integration():
     print("\n\n2. ID-Only Format (Maximum Token Reduction)")
     print("-" * 40)
     
-    params = EnhancedMemosSearchParams(
-        query="",
-        limit=20,
-        response_format=ResponseFormat.ID_ONLY
-    )
+    params = LATEST_IDS
     
     try:
         response = client.search_memos_enhanced(params)
-        mcp_response = {
-            "memos": response.memos,
-            "total_count": response.total_count,
-            "query_metadata": response.query_metadata
-        }
+        mcp_response = response.to_dict()
         
         print(f"Retrieved {len(mcp_response['memos'])} memo IDs")
-        print(f"Response size: {len(json.dumps(mcp_response))} chars")
+        print(f"Response size: {json_size(mcp_response):,} chars")
         print(f"Sample IDs: {[m['id'] for m in mcp_response['memos'][:5]]}")
     except Exception as e:
         print(f"Error: {e}")
@@ -85,21 +84,11 @@ def test_mcp_integration():
     print("\n\n3. Smart Summary with Search Highlighting")
     print("-" * 40)
     
-    params = EnhancedMemosSearchParams(
-        query="task",
-        limit=3,
-        response_format=ResponseFormat.SUMMARY,
-        summary_only=True,
-        content_max_length=200
-    )
+    params = TASK_SUMMARY
     
     try:
         response = client.search_memos_enhanced(params)
-        mcp_response = {
-            "memos": response.memos,
-            "total_count": response.total_count,
-            "query_metadata": response.query_metadata
-        }
+        mcp_response = response.to_dict()
         
         print(f"Found {mcp_response['total_count']} memos containing 'task'")
         
@@ -107,9 +96,10 @@ def test_mcp_integration():
             print(f"\n{i+1}. Memo ID: {memo['id']}")
             print(f"   Relevance: {memo.get('relevance_score', 0):.2f}")
             
-            if 'match_snippets' in memo:
+            snippets = memo.get('match_snippets')
+            if snippets is not None:
                 print("   Matches:")
-                for snippet in memo['match_snippets'][:2]:
+                for snippet in snippets[:2]:
                     print(f"     - {snippet}")
     except Exception as e:
         print(f"Error: {e}")
@@ -129,11 +119,7 @@ def test_mcp_integration():
     
     try:
         response = client.search_memos_enhanced(params)
-        mcp_response = {
-            "memos": response.memos,
-            "total_count": response.total_count,
-            "query_metadata": response.query_metadata
-        }
+        mcp_response = response.to_dict()
         
         print(f"Memos since {date_from}: {mcp_response['total_count']}")
         print(f"Response includes: {response.query_metadata}")
@@ -150,16 +136,12 @@ def test_mcp_integration():
         print(f"Old search_memos() works: {len(old_results)} results")
         
         # Compare sizes
-        old_size = len(json.dumps(old_results[:5]))
+        old_size = json_size(old_results[:5])
         
         # New method with same data
-        params = EnhancedMemosSearchParams(
-            query="test",
-            limit=5,
-            response_format=ResponseFormat.SUMMARY
-        )
+        params = TEST_SUMMARY
         new_response = client.search_memos_enhanced(params)
-        new_size = len(json.dumps(new_response.memos))
+        new_size = json_size(new_response.memos)
         
         print(f"Old method size (5 memos): {old_size} chars")
         print(f"New method size (5 memos): {new_size} chars")
@@ -182,4 +164,8 @@ def test_mcp_integration():
 
 
 if __name__ == "__main__":
-    test_mcp_integration()
\ No newline at end of file
+    client = client_from_env()
+    if client is None:
+        print("Error: MEMOS_API_KEY not set")
+    else:
+        test_mcp_integration(client)
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""Walk search pages against a stubbed Memos API, checking for gaps and repeats"""
+
+import base64
+import json
+from dataclasses import replace
+
+import pytest
+
+from enhanced_memos import EnhancedMemos, EnhancedMemosSearchParams, MemosException, ResponseFormat
+
+
+# Search parameters used below, built once at import
+TIME_ORDERED = EnhancedMemosSearchParams(
+    query="",
+    limit=4,
+    response_format=ResponseFormat.ID_ONLY
+)
+BY_RELEVANCE = EnhancedMemosSearchParams(
+    query="mcp",
+    limit=4,
+    response_format=ResponseFormat.SUMMARY
+)
+
+
+class StubResponse:
+    """Just enough of a requests.Response for EnhancedMemos"""
+
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self.content = json.dumps(body).encode()
+        self.headers = {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise AssertionError(f"unexpected status {self.status_code}")
+
+
+class StubSession:
+    """In-memory Memos API standing in for EnhancedMemos.session"""
+
+    def __init__(self, memos):
+        self.memos = {memo["name"]: memo for memo in memos}
+        self.list_requests = 0
+        self.filtered_requests = 0
+        self.created = 0
+
+    def get(self, url, headers=None, params=None):
+        assert url.endswith("/api/v1/memos"), url
+        if params and "filter" in params:
+            # Only tag filters are pushed down: 'tag in ["a", "b"]'
+            tags = set(json.loads(params["filter"].removeprefix("tag in ")))
+            self.filtered_requests += 1
+            return StubResponse(200, {"memos": [
+                memo for memo in self.memos.values() if tags & set(memo.get("tags", []))
+            ]})
+        self.list_requests += 1
+        return StubResponse(200, {"memos": list(self.memos.values())})
+
+    def post(self, url, data):
+        self.created += 1
+        memo = {
+            "name": f"memos/new{self.created}",
+            "content": json.loads(data)["content"],
+            "createTime": "2025-12-31T00:00:00Z",
+        }
+        self.memos[memo["name"]] = memo
+        return StubResponse(200, memo)
+
+    def patch(self, url, data):
+        name = "memos/" + url.rsplit("/", 1)[1]
+        memo = dict(self.memos[name], content=json.loads(data)["content"])
+        self.memos[name] = memo
+        return StubResponse(200, memo)
+
+    def delete(self, url):
+        del self.memos["memos/" + url.rsplit("/", 1)[1]]
+        return StubResponse(200, {})
+
+    def close(self):
+        pass
+
+
+def make_memos(count=23):
+    """Memos with shared creation times and repeated relevance scores, so ties have to be broken"""
+    return [
+        {
+            "name": f"memos/{i:03d}",
+            "content": " ".join(["mcp"] * (i % 3) + ["note", str(i)]),
+            "createTime": f"2025-01-{i // 3 + 1:02d}T10:00:00Z",
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def stub_client():
+    """EnhancedMemos whose HTTP session is a StubSession"""
+    client = EnhancedMemos("http://memos.invalid", "key")
+    client.session.close()
+    client.session = StubSession(make_memos())
+    yield client
+    client.close()
+
+
+def walk(client, params, resume):
+    """Collect the memo IDs of every page, resuming each page with `resume`"""
+    ids = []
+    while True:
+        response = client.search_memos_enhanced(params)
+        ids.extend(memo["id"] for memo in response.memos)
+        if not response.has_more:
+            return ids
+        assert response.memos, "has_more on an empty page"
+        params = resume(params, response)
+
+
+def by_cursor(params, response):
+    return replace(params, cursor=response.next_cursor)
+
+
+def by_offset(params, response):
+    return replace(params, offset=response.next_offset)
+
+
+def by_after_id(params, response):
+    return replace(params, after_id=response.memos[-1]["id"])
+
+
+@pytest.mark.parametrize("params", [TIME_ORDERED, BY_RELEVANCE], ids=["time", "relevance"])
+def test_pages_have_no_gaps_or_repeats(stub_client, params):
+    """Cursor, offset and after_id walks each return every match exactly once, in the same order"""
+    expected = {
+        memo["name"] for memo in stub_client.session.memos.values()
+        if params.query in memo["content"]
+    }
+
+    walks = {resume.__name__: walk(stub_client, params, resume) for resume in (by_cursor, by_offset, by_after_id)}
+
+    for name, ids in walks.items():
+        assert len(ids) == len(set(ids)), f"{name} repeated memos"
+        assert set(ids) == expected, f"{name} missed {sorted(expected - set(ids))}"
+    assert walks["by_cursor"] == walks["by_offset"] == walks["by_after_id"]
+
+
+def encode(payload):
+    """Encode a cursor payload the way _encode_cursor does"""
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+MALFORMED_CURSORS = [
+    "not base64 at all",
+    encode(["2025-01-01T10:00:00Z", "memos/001"]),
+    encode({"t": 1, "id": "x"}),
+    encode({"t": "2025-01-01T10:00:00Z", "id": None}),
+    encode({"s": "high", "t": "2025-01-01T10:00:00Z", "id": "memos/001"}),
+    encode({"s": True, "t": "2025-01-01T10:00:00Z", "id": "memos/001"}),
+]
+
+
+@pytest.mark.parametrize("params", [TIME_ORDERED, BY_RELEVANCE], ids=["time", "relevance"])
+@pytest.mark.parametrize("cursor", MALFORMED_CURSORS)
+def test_malformed_cursor_is_rejected(stub_client, params, cursor):
+    """A cursor with missing or mistyped fields is reported, not compared against the index"""
+    with pytest.raises(MemosException, match="Invalid cursor"):
+        stub_client.search_memos_enhanced(replace(params, cursor=cursor))
+
+
+def test_writes_update_the_index(stub_client):
+    """Creates, updates and deletes show up in later walks without refetching the memo list"""
+    session = stub_client.session
+    walk(stub_client, TIME_ORDERED, by_cursor)
+    assert session.list_requests == 1
+
+    created = stub_client.create_memo("mcp fresh")
+    stub_client.update_memo("memos/000", "mcp mcp mcp now relevant")
+    stub_client.delete_memo("memos/004")
+
+    ids = walk(stub_client, TIME_ORDERED, by_cursor)
+    assert session.list_requests == 1
+    assert len(ids) == len(set(ids))
+    assert set(ids) == set(session.memos)
+    assert ids[0] == created["name"]
+
+    ranked = walk(stub_client, BY_RELEVANCE, by_after_id)
+    assert ranked[0] == "memos/000"
+    assert "memos/004" not in ranked
+
+
+def test_cached_memo_is_a_copy(stub_client):
+    """Mutating a memo served from the index does not change later lookups"""
+    stub_client.session.memos["memos/001"]["tags"] = ["work"]
+    stub_client.search_memos_enhanced(TIME_ORDERED)
+
+    memo = stub_client.get_memo_by_id("memos/001")
+    memo["tags"].append("changed")
+    memo["content"] = "changed"
+
+    again = stub_client.get_memo_by_id("memos/001")
+    assert again["tags"] == ["work"]
+    assert again["content"] != "changed"
+    assert stub_client.session.list_requests == 1
+
+
+def test_full_format_is_a_copy(stub_client):
+    """Mutating a FULL-format search result does not change later searches"""
+    stub_client.session.memos["memos/001"]["tags"] = ["work"]
+    full = replace(TIME_ORDERED, fields=["tags"], response_format=ResponseFormat.FULL, limit=50)
+
+    memo = next(m for m in stub_client.search_memos_enhanced(full).memos if m["id"] == "memos/001")
+    memo["tags"].append("changed")
+
+    again = next(m for m in stub_client.search_memos_enhanced(full).memos if m["id"] == "memos/001")
+    assert again["tags"] == ["work"]
+
+
+def test_after_id_outside_tag_filter(stub_client):
+    """A tag-filtered page resumes after any memo, cold or warm, with the same result"""
+    session = stub_client.session
+    for name in ("memos/003", "memos/006", "memos/012"):
+        session.memos[name]["tags"] = ["work"]
+    params = replace(TIME_ORDERED, tags_filter=["work"], after_id="memos/010")
+
+    # Cold: nothing cached, and memos/010 does not have the tag
+    cold = stub_client.search_memos_enhanced(params)
+    assert session.filtered_requests == 0
+
+    # Warm: served from the cached full list
+    warm = stub_client.search_memos_enhanced(params)
+    assert session.list_requests == 1
+
+    assert [m["id"] for m in cold.memos] == [m["id"] for m in warm.memos] == ["memos/006", "memos/003"]
+
+    # Without after_id a cold tag search still lets the server filter
+    stub_client._invalidate_cache()
+    stub_client.search_memos_enhanced(replace(params, after_id=None))
+    assert session.filtered_requests == 1
@@ -1,34 +1,56 @@
 #!/usr/bin/env python3
 """Test script for enhanced Memos pagination and response formatting"""
 
-import json
-import os
-from enhanced_memos import EnhancedMemos, EnhancedMemosSearchParams, ResponseFormat, SearchResponse
+from enhanced_memos import EnhancedMemosSearchParams, ResponseFormat, SearchResponse
+from test_utils import PROJECTION_FIELDS, client_from_env, dumps_pretty, json_size, prefetched_pages, project, wire_size
 
 
-def test_pagination():
+# Search parameters used below, built once at import
+BASIC_PAGE = EnhancedMemosSearchParams(
+    query="",
+    limit=5,
+    offset=0,
+    response_format=ResponseFormat.MINIMAL
+)
+OFFSET_PAGE = EnhancedMemosSearchParams(
+    query="",
+    limit=3,
+    offset=5,
+    response_format=ResponseFormat.SUMMARY
+)
+WALK_PAGES = EnhancedMemosSearchParams(
+    query="",
+    limit=5,
+    response_format=ResponseFormat.ID_ONLY
+)
+PROJECTION_MEMO = EnhancedMemosSearchParams(
+    query="",
+    limit=1,
+    fields=PROJECTION_FIELDS,
+    response_format=ResponseFormat.FULL
+)
+MCP_SEARCH = EnhancedMemosSearchParams(
+    query="mcp",  # Search for MCP-related memos
+    limit=5,
+    response_format=ResponseFormat.SUMMARY
+)
+PAGINATED_SUMMARY = EnhancedMemosSearchParams(
+    query="",
+    limit=10,
+    response_format=ResponseFormat.SUMMARY,
+    content_max_length=200
+)
+
+
+def test_pagination(memos_client):
     """Test pagination functionality"""
-    # Get credentials from environment
-    memos_url = os.getenv("MEMOS_URL", "https://memos.galatek.dev")
-    memos_api_key = os.getenv("MEMOS_API_KEY", "")
-    
-    if not memos_api_key:
-        print("Error: MEMOS_API_KEY not set")
-        return
-    
-    # Initialize client
-    client = EnhancedMemos(memos_url, memos_api_key)
+    client = memos_client
     
     print("Testing Enhanced Memos Pagination\n" + "="*50)
     
     # Test 1: Basic pagination with limit
     print("\nTest 1: Basic Pagination (limit=5)")
-    params = EnhancedMemosSearchParams(
-        query="",
-        limit=5,
-        offset=0,
-        response_format=ResponseFormat.MINIMAL
-    )
+    params = BASIC_PAGE
     
     try:
         response = client.search_memos_enhanced(params)
@@ -36,18 +58,13 @@ def test_pagination():
         print(f"Returned: {len(response.memos)}")
         print(f"Has more: {response.has_more}")
         print(f"Next offset: {response.next_offset}")
-        print(f"Sample memo (minimal format): {json.dumps(response.memos[0] if response.memos else {}, indent=2)}")
+        print(f"Sample memo (minimal format): {dumps_pretty(response.memos[0] if response.memos else {})}")
     except Exception as e:
         print(f"Error: {e}")
     
     # Test 2: Pagination with offset
     print("\n\nTest 2: Pagination with Offset (limit=3, offset=5)")
-    params = EnhancedMemosSearchParams(
-        query="",
-        limit=3,
-        offset=5,
-        response_format=ResponseFormat.SUMMARY
-    )
+    params = OFFSET_PAGE
     
     try:
         response = client.search_memos_enhanced(params)
@@ -59,22 +76,41 @@ def test_pagination():
     except Exception as e:
         print(f"Error: {e}")
     
+    # Test 2b: Walking pages, with the next pages prefetched
+    print("\n\nTest 2b: Walking Pages with Prefetch (limit=5, 4 pages)")
+    params = WALK_PAGES
+    
+    seen_ids = set()
+    repeated_ids = set()
+    try:
+        for page_number, response in enumerate(prefetched_pages(client, params, max_pages=4), 1):
+            page_ids = [memo["id"] for memo in response.memos]
+            print(f"Page {page_number}: {len(page_ids)} memos, has more: {response.has_more}")
+            repeated_ids.update(seen_ids.intersection(page_ids))
+            seen_ids.update(page_ids)
+    except Exception as e:
+        print(f"Error: {e}")
+    assert not repeated_ids, f"pages overlap: {sorted(repeated_ids)}"
+    
     # Test 3: Response formats comparison
     print("\n\nTest 3: Response Format Comparison")
     
     formats = [ResponseFormat.ID_ONLY, ResponseFormat.MINIMAL, ResponseFormat.SUMMARY, ResponseFormat.FULL]
     
+    # Fetch once in FULL and project the memo to each format
+    params = PROJECTION_MEMO
+    try:
+        full_memos = client.search_memos_enhanced(params).memos
+    except Exception as e:
+        print(f"Error: {e}")
+        full_memos = []
+    
     for fmt in formats:
-        params = EnhancedMemosSearchParams(
-            query="",
-            limit=1,
-            response_format=fmt
-        )
         try:
-            response = client.search_memos_enhanced(params)
-            if response.memos:
-                memo = response.memos[0]
-                memo_json = json.dumps(memo, indent=2)
+            memos = project(client, full_memos, fmt)
+            if memos:
+                memo = memos[0]
+                memo_json = dumps_pretty(memo)
                 print(f"\n{fmt.value.upper()} format (size: {len(memo_json)} chars):")
                 if len(memo_json) > 200:
                     print(memo_json[:200] + "...")
@@ -85,11 +121,7 @@ def test_pagination():
     
     # Test 4: Search with pagination
     print("\n\nTest 4: Search with Pagination")
-    params = EnhancedMemosSearchParams(
-        query="mcp",  # Search for MCP-related memos
-        limit=5,
-        response_format=ResponseFormat.SUMMARY
-    )
+    params = MCP_SEARCH
     
     try:
         response = client.search_memos_enhanced(params)
@@ -107,20 +139,17 @@ def test_pagination():
     
     # Full response (old method simulation)
     all_memos = client.search_memos("")  # Old method returns all
-    full_size = len(json.dumps(all_memos))
+    full_size = json_size(all_memos)
     
     # New paginated response
-    params = EnhancedMemosSearchParams(
-        query="",
-        limit=10,
-        response_format=ResponseFormat.SUMMARY,
-        content_max_length=200
-    )
+    params = PAGINATED_SUMMARY
     response = client.search_memos_enhanced(params)
-    paginated_size = len(json.dumps(response.memos))
+    paginated_size = json_size(response.memos)
     
     print(f"Full response size: {full_size:,} chars")
     print(f"Paginated response size: {paginated_size:,} chars")
+    print(f"Full response on the wire (gzip): {wire_size(all_memos):,} bytes")
+    print(f"Paginated response on the wire (gzip): {wire_size(response.memos):,} bytes")
     print(f"Reduction: {((full_size - paginated_size) / full_size * 100):.1f}%")
     
     # Test 6: Backward compatibility
@@ -137,4 +166,8 @@ def test_pagination():
 
 
 if __name__ == "__main__":
-    test_pagination()
\ No newline at end of file
+    client = client_from_env()
+    if client is None:
+        print("Error: MEMOS_API_KEY not set")
+    else:
+        test_pagination(client)
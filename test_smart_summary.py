@@ -1,35 +1,63 @@
 #!/usr/bin/env python3
 """Test script for smart content summarization features"""
 
-import json
-import os
-from enhanced_memos import EnhancedMemos, EnhancedMemosSearchParams, ResponseFormat
+from dataclasses import replace
+from enhanced_memos import EnhancedMemos, EnhancedMemosSearchParams, Memo, ResponseFormat
+from test_utils import PROJECTION_FIELDS, client_from_env, json_size, project
 
 
-def test_smart_summarization():
+# Search parameters used below, built once at import
+MCP_SNIPPETS = EnhancedMemosSearchParams(
+    query="mcp",
+    limit=5,
+    response_format=ResponseFormat.SUMMARY,
+    summary_only=True,
+    content_max_length=300
+)
+REGULAR_TRUNCATION = EnhancedMemosSearchParams(
+    query="",
+    limit=1,
+    response_format=ResponseFormat.SUMMARY,
+    summary_only=False,
+    content_max_length=200
+)
+SMART_TRUNCATION = replace(REGULAR_TRUNCATION, summary_only=True)
+NOTION_RELEVANCE = EnhancedMemosSearchParams(
+    query="notion",
+    limit=10,
+    response_format=ResponseFormat.SUMMARY,
+    summary_only=True
+)
+PROJECTION_PAGE = EnhancedMemosSearchParams(
+    query="",
+    limit=5,
+    fields=PROJECTION_FIELDS,
+    response_format=ResponseFormat.FULL
+)
+SMART_SUMMARY = EnhancedMemosSearchParams(
+    query="",
+    limit=5,
+    response_format=ResponseFormat.SUMMARY,
+    summary_only=True,
+    content_max_length=200
+)
+TASK_HIGHLIGHTS = EnhancedMemosSearchParams(
+    query="task",
+    limit=3,
+    response_format=ResponseFormat.SUMMARY,
+    summary_only=True
+)
+
+
+def test_smart_summarization(memos_client):
     """Test smart summarization functionality"""
-    # Get credentials from environment
-    memos_url = os.getenv("MEMOS_URL", "https://memos.galatek.dev")
-    memos_api_key = os.getenv("MEMOS_API_KEY", "")
-    
-    if not memos_api_key:
-        print("Error: MEMOS_API_KEY not set")
-        return
-    
-    # Initialize client
-    client = EnhancedMemos(memos_url, memos_api_key)
+    client = memos_client
     
     print("Testing Smart Content Summarization\n" + "="*50)
     
     # Test 1: Search with snippet extraction
     print("\nTest 1: Search with Snippet Extraction")
-    params = EnhancedMemosSearchParams(
-        query="mcp",
-        limit=5,
-        response_format=ResponseFormat.SUMMARY,
-        summary_only=True,
-        content_max_length=300
-    )
+    params = MCP_SNIPPETS
     
     try:
         response = client.search_memos_enhanced(params)
@@ -40,9 +68,10 @@ def test_smart_summarization():
             print(f"   Relevance Score: {memo.get('relevance_score', 0):.2f}")
             
             # Show match snippets
-            if 'match_snippets' in memo:
+            snippets = memo.get('match_snippets')
+            if snippets is not None:
                 print("   Match Snippets:")
-                for j, snippet in enumerate(memo['match_snippets']):
+                for j, snippet in enumerate(snippets):
                     print(f"     {j+1}: {snippet}")
             
             # Show smart summary
@@ -54,22 +83,10 @@ def test_smart_summarization():
     print("\n\nTest 2: Smart Summary vs Regular Truncation")
     
     # Regular truncation
-    params_regular = EnhancedMemosSearchParams(
-        query="",
-        limit=1,
-        response_format=ResponseFormat.SUMMARY,
-        summary_only=False,
-        content_max_length=200
-    )
+    params_regular = REGULAR_TRUNCATION
     
     # Smart summary
-    params_smart = EnhancedMemosSearchParams(
-        query="",
-        limit=1,
-        response_format=ResponseFormat.SUMMARY,
-        summary_only=True,
-        content_max_length=200
-    )
+    params_smart = SMART_TRUNCATION
     
     try:
         response_regular = client.search_memos_enhanced(params_regular)
@@ -85,74 +102,55 @@ def test_smart_summarization():
     
     # Test 3: Relevance scoring
     print("\n\nTest 3: Relevance Scoring for Search Results")
-    params = EnhancedMemosSearchParams(
-        query="notion",
-        limit=10,
-        response_format=ResponseFormat.SUMMARY,
-        summary_only=True
-    )
+    params = NOTION_RELEVANCE
     
     try:
         response = client.search_memos_enhanced(params)
         print(f"Search results for 'notion' (sorted by relevance):")
         
-        for i, memo in enumerate(response.memos[:5]):
-            score = memo.get('relevance_score', 0)
+        scores = [memo.get('relevance_score', 0) for memo in response.memos[:5]]
+        for i, (score, memo) in enumerate(zip(scores, response.memos)):
             print(f"\n{i+1}. Score: {score:.2f} - {memo['id']}")
             
             # Show why it's relevant
-            if 'match_snippets' in memo and memo['match_snippets']:
-                print(f"   First match: {memo['match_snippets'][0][:100]}...")
+            snippets = memo.get('match_snippets')
+            if snippets:
+                print(f"   First match: {snippets[0][:100]}...")
     except Exception as e:
         print(f"Error: {e}")
     
     # Test 4: Token reduction with smart summaries
     print("\n\nTest 4: Token Reduction Analysis")
     
-    # Get a memo with full content
-    params_full = EnhancedMemosSearchParams(
-        query="",
-        limit=5,
-        response_format=ResponseFormat.FULL
-    )
-    
-    params_smart = EnhancedMemosSearchParams(
-        query="",
-        limit=5,
-        response_format=ResponseFormat.SUMMARY,
-        summary_only=True,
-        content_max_length=200
-    )
+    # Fetch once in FULL and project the same memos to smart summaries
+    params_full = PROJECTION_PAGE
+    
+    params_smart = SMART_SUMMARY
     
     try:
-        response_full = client.search_memos_enhanced(params_full)
-        response_smart = client.search_memos_enhanced(params_smart)
+        memos = client.search_memos_enhanced(params_full).memos
+        memos_full = project(client, memos, ResponseFormat.FULL)
+        memos_smart = project(client, memos, ResponseFormat.SUMMARY, params_smart)
         
-        full_size = len(json.dumps(response_full.memos))
-        smart_size = len(json.dumps(response_smart.memos))
+        full_sizes = [json_size(memo) for memo in memos_full]
+        smart_sizes = [json_size(memo) for memo in memos_smart]
+        full_size = json_size(memos_full)
+        smart_size = json_size(memos_smart)
         
         print(f"Full content size: {full_size:,} chars")
         print(f"Smart summary size: {smart_size:,} chars")
         print(f"Reduction: {((full_size - smart_size) / full_size * 100):.1f}%")
         
         # Show character savings per memo
-        if response_full.memos and response_smart.memos:
-            for i in range(min(3, len(response_full.memos))):
-                full_memo_size = len(json.dumps(response_full.memos[i]))
-                smart_memo_size = len(json.dumps(response_smart.memos[i]))
-                print(f"\nMemo {i+1}: {full_memo_size:,} -> {smart_memo_size:,} chars "
-                      f"({((full_memo_size - smart_memo_size) / full_memo_size * 100):.1f}% reduction)")
+        for i, (full_memo_size, smart_memo_size) in enumerate(zip(full_sizes[:3], smart_sizes)):
+            print(f"\nMemo {i+1}: {full_memo_size:,} -> {smart_memo_size:,} chars "
+                  f"({((full_memo_size - smart_memo_size) / full_memo_size * 100):.1f}% reduction)")
     except Exception as e:
         print(f"Error: {e}")
     
     # Test 5: Highlighting in search results
     print("\n\nTest 5: Search Term Highlighting")
-    params = EnhancedMemosSearchParams(
-        query="task",
-        limit=3,
-        response_format=ResponseFormat.SUMMARY,
-        summary_only=True
-    )
+    params = TASK_HIGHLIGHTS
     
     try:
         response = client.search_memos_enhanced(params)
@@ -160,13 +158,32 @@ def test_smart_summarization():
         
         for i, memo in enumerate(response.memos):
             print(f"\n{i+1}. {memo['id']}")
-            if 'match_snippets' in memo:
-                for snippet in memo['match_snippets'][:2]:
+            snippets = memo.get('match_snippets')
+            if snippets is not None:
+                for snippet in snippets[:2]:
                     # The snippet should have **task** highlighted
                     print(f"   → {snippet}")
     except Exception as e:
         print(f"Error: {e}")
 
 
+def test_summary_keeps_tag_and_dash_lines():
+    """Lines that only look like headers or list items still reach the summary"""
+    client = EnhancedMemos("http://memos.invalid", "key")
+    memo = Memo.from_api({
+        "name": "memos/1",
+        "content": "Title\n# Header\n- item\n-note without a space\nplain line\n#work #idea",
+    })
+    
+    summary = client._generate_smart_summary(memo).split("\n")
+    client.close()
+    
+    # Headers and list items first, then every other line once
+    assert summary == ["Title", "# Header", "- item", "-note without a space", "plain line", "#work #idea"]
+
 if __name__ == "__main__":
-    test_smart_summarization()
\ No newline at end of file
+    client = client_from_env()
+    if client is None:
+        print("Error: MEMOS_API_KEY not set")
+    else:
+        test_smart_summarization(client)
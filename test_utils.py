@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""Shared helpers for the enhanced Memos test scripts"""
+
+import copy
+import functools
+import gzip
+import json
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import astuple, replace
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+from enhanced_memos import EnhancedMemos, EnhancedMemosSearchParams, Memo, ResponseFormat, SearchResponse
+
+
+_SIZE_ENCODER = json.JSONEncoder()
+
+
+def json_size(obj: Any) -> int:
+    """
+    Length of json.dumps(obj), counted chunk by chunk without building the string.
+
+    Args:
+        obj: JSON-serializable value to measure
+
+    Returns:
+        Number of characters json.dumps would produce
+    """
+    return sum(len(chunk) for chunk in _SIZE_ENCODER.iterencode(obj))
+
+
+def wire_size(obj: Any) -> int:
+    """
+    Gzip-compressed size of obj's JSON, as it would travel with gzip transfer encoding.
+
+    Args:
+        obj: JSON-serializable value to measure
+
+    Returns:
+        Number of compressed bytes
+    """
+    encoded = orjson.dumps(obj) if orjson is not None else json.dumps(obj).encode()
+    return len(gzip.compress(encoded))
+
+
+def dumps_pretty(obj: Any) -> str:
+    """Indented JSON for printing, via orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2)
+
+
+# Raw memo fields that every response format can be projected from
+PROJECTION_FIELDS = ['name', 'content', 'tags', 'createTime', 'updateTime', 'snippet']
+
+
+def project(client: EnhancedMemos, memos: List[Dict[str, Any]], fmt: ResponseFormat,
+            params: Optional[EnhancedMemosSearchParams] = None) -> List[Dict[str, Any]]:
+    """
+    Re-format memos from a FULL response as another response format.
+
+    The memos must have been fetched with fields=PROJECTION_FIELDS; each one
+    is passed through the client's own formatter for `fmt`, so one FULL
+    search can stand in for a search per format.
+
+    Args:
+        client: Client whose formatters to use
+        memos: Memos from a FULL search with fields=PROJECTION_FIELDS
+        fmt: Response format to project to
+        params: Search parameters the projection should mirror (default: defaults)
+
+    Returns:
+        Memos as a search in `fmt` would have returned them
+    """
+    params = replace(params or EnhancedMemosSearchParams(), response_format=fmt)
+    format_memo = client._formatters[fmt]
+    query_lower = params.query.lower()
+    return [format_memo(Memo.from_api(memo), params, query_lower) for memo in memos]
+
+
+def _params_key(params: EnhancedMemosSearchParams) -> Tuple:
+    """Freeze search parameters into a hashable cache key (lists become tuples)"""
+    return tuple(tuple(value) if isinstance(value, list) else value for value in astuple(params))
+
+
+class CachedEnhancedMemos(EnhancedMemos):
+    """
+    EnhancedMemos that memoizes search results for the length of a test run.
+
+    Test scripts repeat identical searches back to back; each one is
+    answered once and then served from memory. Results are deep-copied
+    on return, so callers cannot alter the cached memos. The caches
+    belong to the instance and are dropped with it.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._search = functools.lru_cache(maxsize=128)(self._search_uncached)
+        self._search_enhanced = functools.lru_cache(maxsize=128)(self._search_enhanced_uncached)
+
+    def search_memos(self, query: str) -> List[Dict[str, Any]]:
+        return copy.deepcopy(list(self._search(query)))
+
+    def search_memos_enhanced(self, params: EnhancedMemosSearchParams) -> SearchResponse:
+        response = copy.deepcopy(self._search_enhanced(_params_key(params)))
+        response.memos = list(response.memos)
+        return response
+
+    def _search_uncached(self, query: str) -> Tuple[Dict[str, Any], ...]:
+        return tuple(super().search_memos(query))
+
+    def _search_enhanced_uncached(self, key: Tuple) -> SearchResponse:
+        # Rebuild the params positionally from the frozen key
+        params = EnhancedMemosSearchParams(*(list(value) if isinstance(value, tuple) else value for value in key))
+        response = super().search_memos_enhanced(params)
+        return replace(response, memos=tuple(response.memos))
+
+
+def prefetched_pages(client: EnhancedMemos, params: EnhancedMemosSearchParams,
+                     depth: int = 3, max_pages: Optional[int] = None) -> Iterator[SearchResponse]:
+    """
+    Walk search result pages while the next ones are fetched in the background.
+
+    Pages are requested by offset, `depth` pages ahead of the one being
+    consumed, so the caller's work on a page overlaps the following fetches.
+
+    Args:
+        client: Client to search with
+        params: Parameters of the first page (its limit is the page size)
+        depth: Number of pages to keep in flight
+        max_pages: Stop after this many pages (default: walk to the end)
+
+    Yields:
+        One SearchResponse per page, in order
+    """
+    executor = ThreadPoolExecutor(max_workers=depth)
+    pending = deque()
+    next_offset = params.offset
+
+    def schedule():
+        nonlocal next_offset
+        pending.append(executor.submit(client.search_memos_enhanced, replace(params, offset=next_offset)))
+        next_offset += params.limit
+
+    try:
+        for _ in range(depth if max_pages is None else min(depth, max_pages)):
+            schedule()
+
+        pages = 0
+        while pending:
+            response = pending.popleft().result()
+            pages += 1
+            yield response
+            if not response.has_more or pages == max_pages:
+                break
+            if max_pages is None or pages + len(pending) < max_pages:
+                schedule()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def client_from_env() -> Optional[CachedEnhancedMemos]:
+    """
+    Build the test client from MEMOS_URL and MEMOS_API_KEY.
+
+    Returns:
+        A CachedEnhancedMemos client, or None if MEMOS_API_KEY is not set
+    """
+    memos_url = os.getenv("MEMOS_URL", "https://memos.galatek.dev")
+    memos_api_key = os.getenv("MEMOS_API_KEY", "")
+    if not memos_api_key:
+        return None
+    return CachedEnhancedMemos(memos_url, memos_api_key)